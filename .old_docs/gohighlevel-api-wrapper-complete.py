@@ -23,16 +23,35 @@ Usage:
         last_name="Doe", 
         email="john@example.com"
     )
+    
+    # Async client for overlapping many calls
+    from gohighlevel_complete_api import GoHighLevelAsyncAPI
+    
+    async with GoHighLevelAsyncAPI(location_id="...", api_key="...") as api:
+        posts = await api.get_blog_posts_all(blog_id="blog_123")
 """
 
+import asyncio
+import copy
+import functools
+import math
+import httpx
 import requests
+import orjson
 import time
-import json
+import random
 import re
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any, Union
-from urllib.parse import urljoin
+from requests.adapters import HTTPAdapter
+from requests_toolbelt.multipart.encoder import MultipartEncoder
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from dotenv import load_dotenv
 import os
 
@@ -41,6 +60,23 @@ load_dotenv()
 API_KEY = os.getenv("GHL_API_KEY", "your_api_key_here")
 LOCATION_ID = os.getenv("GHL_LOCATION_ID", "your_location_id_here")
 
+# Utility-method patterns, compiled once for bulk import loops
+_SLUG_STRIP = re.compile(r'[^a-z0-9\s-]')
+_SLUG_SPACES = re.compile(r'\s+')
+_SLUG_DASHES = re.compile(r'-+')
+_NON_DIGITS = re.compile(r'\D')
+
+# Single-pass ASCII slug table: lowercase letters, keep digits and hyphens,
+# whitespace -> hyphen, drop everything else (same result as the regexes)
+_SLUG_TABLE = str.maketrans({
+    chr(i): (
+        chr(i).lower() if chr(i).isalnum() or chr(i) == '-'
+        else '-' if _SLUG_SPACES.fullmatch(chr(i))
+        else None
+    )
+    for i in range(128)
+})
+
 class GoHighLevelAPIError(Exception):
     """
     Custom exception for GoHighLevel API errors.
@@ -58,6 +94,8 @@ class GoHighLevelAPIError(Exception):
             print(f"Status: {e.status_code}")
     """
     
+    __slots__ = ('message', 'status_code', 'response_data')
+    
     def __init__(
         self, 
         message: str, 
@@ -70,6 +108,33 @@ class GoHighLevelAPIError(Exception):
         self.response_data = response_data
 
 
+def _ttl_cached(ttl_seconds: float):
+    """
+    Cache a read-only endpoint method's response per client for ttl_seconds.
+    
+    Entries are keyed by method name and call arguments and stored on the
+    instance (``self._cache``). Callers always get a deep copy, so mutating a
+    returned dict never corrupts the cache. Works for both clients: storing
+    and returning go through ``_cache_store`` / ``_cached_return``, which
+    GoHighLevelAsyncAPI overrides as coroutines.
+    
+    Args:
+        ttl_seconds: How long a cached response stays fresh
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            key = (func.__name__, args, frozenset(kwargs.items()))
+            entry = self._cache.get(key)
+            
+            if entry is not None and time.monotonic() - entry[0] < ttl_seconds:
+                return self._cached_return(entry[1])
+            
+            return self._cache_store(key, func(self, *args, **kwargs))
+        return wrapper
+    return decorator
+
+
 class GoHighLevelAPI:
     """
     Complete GoHighLevel API v2.0 Wrapper
@@ -103,11 +168,64 @@ class GoHighLevelAPI:
         >>> print(contact['contact']['id'])
     """
     
+    # GoHighLevel endpoint paths (relative to base_url), keyed by method name
+    _EP = {
+        'create_blog_post': 'blogs/posts',
+        'update_blog_post': 'blogs/posts/{post_id}',
+        'get_blog_posts': 'blogs/posts/all',
+        'get_blogs_by_location': 'blogs/site/all',
+        'check_url_slug_exists': 'blogs/posts/url-slug-exists',
+        'get_blog_authors': 'blogs/authors',
+        'get_blog_categories': 'blogs/categories',
+        'delete_blog_post': 'blogs/posts/{post_id}',
+        'upload_media_file': 'medias/upload-file',
+        'get_media_files': 'medias/files',
+        'delete_media_file': 'medias/{file_id}',
+        'get_form_submissions': 'forms/submissions',
+        'get_forms': 'forms/',
+        'create_contact': 'contacts/',
+        'get_contact': 'contacts/{contact_id}',
+        'update_contact': 'contacts/{contact_id}',
+        'delete_contact': 'contacts/{contact_id}',
+        'search_contacts': 'contacts/'
+    }
+    
+    # Adaptive token bucket tuning (rates in requests/second)
+    RATE_INITIAL = 10.0
+    RATE_MAX = 20.0
+    RATE_MIN = 1.0
+    RATE_INCREASE_STEP = 0.1
+    RATE_INCREASE_FACTOR = 0.01
+    RATE_DECREASE_FACTOR = 0.5
+    BUCKET_CAPACITY = 10.0
+    
+    # Transient failures retried with capped exponential backoff + jitter
+    RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+    RETRY_BACKOFF_BASE = 0.5
+    RETRY_BACKOFF_CAP = 30.0
+    
+    # Methods with side effects get an Idempotency-Key reused across retries
+    WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+    
+    # Keep-alive pool sized for paginated / fanned-out workloads
+    POOL_CONNECTIONS = 32
+    POOL_MAXSIZE = 64
+    
+    # Threads used to fetch remaining pages in the *_all pagination helpers
+    PAGE_FETCH_WORKERS = 8
+    
+    # Threads used by batch_upload_images to overlap uploads
+    UPLOAD_WORKERS = 8
+    
+    # Slug variants checked concurrently per round in ensure_unique_slug
+    SLUG_PROBE_BATCH = 8
+    
     def __init__(
         self, 
         location_id: str, 
         api_key: str, 
-        base_url: str = "https://services.leadconnectorhq.com"
+        base_url: str = "https://services.leadconnectorhq.com",
+        max_retries: int = 3
     ):
         """
         Initialize GoHighLevel API client.
@@ -116,6 +234,7 @@ class GoHighLevelAPI:
             location_id: The GoHighLevel location ID (found in Settings > API)
             api_key: API authentication key (Bearer token)
             base_url: API base URL (default: official production URL)
+            max_retries: Retries for 429/5xx responses before raising (default 3)
         
         Example:
             >>> api = GoHighLevelAPI(
@@ -125,30 +244,239 @@ class GoHighLevelAPI:
         """
         self.location_id = location_id
         self.api_key = api_key
-        self.base_url = base_url
+        # Normalized once so request URLs are plain concatenation
+        self.base_url = base_url.rstrip('/') + '/'
+        self.max_retries = max_retries
         self.session = requests.Session()
         
+        # Warm connection pool; retries are handled in _make_request, not urllib3
+        adapter = HTTPAdapter(
+            pool_connections=self.POOL_CONNECTIONS,
+            pool_maxsize=self.POOL_MAXSIZE,
+            pool_block=False,
+            max_retries=Retry(total=0)
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
+        # Header-less pooled session for third-party URLs (image checks), so
+        # the API bearer token never goes to other hosts
+        self._asset_session = requests.Session()
+        
         # Set default headers
         self.session.headers.update({
             "Authorization": f"Bearer {api_key}",
             "Version": "2021-07-28",
             "Content-Type": "application/json",
-            "Accept": "application/json"
+            "Accept": "application/json",
+            # gzip/deflate plus br/zstd when their decoders are installed,
+            # so we never advertise an encoding requests can't decode
+            "Accept-Encoding": ACCEPT_ENCODING,
+            "Connection": "keep-alive"
         })
+        # Pre-encode once; http.client otherwise latin-1 encodes every str
+        # header value on every send
+        for name, value in self.session.headers.items():
+            if isinstance(value, str):
+                self.session.headers[name] = value.encode('latin-1')
+        
+        # Rate limiting (adaptive token bucket, shared across threads)
+        self._bucket = {
+            'tokens': self.BUCKET_CAPACITY,
+            'rate': self.RATE_INITIAL,
+            'last': time.monotonic(),
+            'capacity': self.BUCKET_CAPACITY,
+            'blocked_until': 0.0
+        }
+        self._bucket_lock = threading.Lock()
+        
+        # Short-lived response cache for rarely-changing list endpoints
+        self._cache: Dict[tuple, tuple] = {}
+        
+        # Slugs confirmed taken by ensure_unique_slug (taken slugs stay taken)
+        self._taken_slugs: set = set()
+    
+    def clear_cache(self):
+        """Drop all cached responses (authors, categories, forms, blogs, image checks) and known-taken slugs."""
+        self._cache.clear()
+        self._taken_slugs.clear()
+    
+    def _cache_store(self, key: tuple, response: Dict) -> Dict:
+        """Store a fresh response for _ttl_cached and return a copy of it."""
+        self._cache[key] = (time.monotonic(), response)
+        return copy.deepcopy(response)
+    
+    def _cached_return(self, response: Dict) -> Dict:
+        """Return a copy of a cached response for _ttl_cached."""
+        return copy.deepcopy(response)
+    
+    def _reserve_token(self) -> float:
+        """
+        Take one token from the rate-limit bucket.
+        
+        Tokens refill continuously at the current adaptive rate, clamped to
+        the bucket capacity. When the bucket is empty the token is borrowed
+        and the caller is told how long to wait, so the lock is never held
+        while sleeping.
+        
+        Returns:
+            float: Seconds the caller must wait before sending the request
+        """
+        with self._bucket_lock:
+            bucket = self._bucket
+            now = time.monotonic()
+            bucket['tokens'] = min(
+                bucket['capacity'],
+                bucket['tokens'] + (now - bucket['last']) * bucket['rate']
+            )
+            bucket['last'] = now
+            bucket['tokens'] -= 1
+            
+            wait = max(0.0, bucket['blocked_until'] - now)
+            if bucket['tokens'] < 0:
+                wait = max(wait, -bucket['tokens'] / bucket['rate'])
+            return wait
+    
+    def _update_rate(self, response):
+        """
+        Adapt the token bucket refill rate to the API's response.
+        
+        Successful responses grow the rate additively plus a small
+        proportional term (up to RATE_MAX); 429/503 responses cut it
+        multiplicatively (down to RATE_MIN), drain the bucket and honor
+        any Retry-After header.
+        
+        Args:
+            response: requests.Response or httpx.Response
+        """
+        status = response.status_code
+        
+        with self._bucket_lock:
+            bucket = self._bucket
+            
+            if 200 <= status < 300:
+                bucket['rate'] = min(
+                    self.RATE_MAX,
+                    bucket['rate'] + self.RATE_INCREASE_STEP + self.RATE_INCREASE_FACTOR * bucket['rate']
+                )
+            elif status in (429, 503):
+                bucket['rate'] = max(self.RATE_MIN, self.RATE_DECREASE_FACTOR * bucket['rate'])
+                bucket['tokens'] = 0.0
+                
+                retry_after = self._retry_after_seconds(response)
+                if retry_after:
+                    bucket['blocked_until'] = time.monotonic() + retry_after
+    
+    @staticmethod
+    def _retry_after_seconds(response) -> Optional[float]:
+        """
+        Parse a Retry-After header (delta-seconds or HTTP date).
+        
+        Returns:
+            Optional[float]: Seconds to wait, or None if absent/unparseable
+        """
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
         
-        # Rate limiting
-        self.last_request_time = 0
-        self.min_request_interval = 0.1  # 100ms between requests
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    
+    def _retry_delay(self, attempt: int, response) -> float:
+        """
+        Seconds to wait before retrying a failed request.
+        
+        Uses the server's Retry-After when given, otherwise
+        min(cap, base * 2**attempt) scaled by a random jitter of 0.5x-1.5x.
+        """
+        retry_after = self._retry_after_seconds(response)
+        if retry_after is not None:
+            return retry_after
+        
+        backoff = min(self.RETRY_BACKOFF_CAP, self.RETRY_BACKOFF_BASE * 2 ** attempt)
+        return backoff * random.uniform(0.5, 1.5)
+    
+    def _request_attempts(self, files: Optional[Dict]) -> int:
+        """Total send attempts allowed for a request."""
+        # File handles are consumed by the first send, so uploads aren't replayed
+        return 1 if files else self.max_retries + 1
     
     def _rate_limit(self):
         """Implement rate limiting to prevent API throttling."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+        wait = self._reserve_token()
+        
+        if wait > 0:
+            time.sleep(wait)
+    
+    def _inject_location(self, payload: Dict) -> Dict:
+        """
+        Add this client's locationId to a body or query dict.
         
-        if time_since_last < self.min_request_interval:
-            time.sleep(self.min_request_interval - time_since_last)
+        Only called by endpoints whose GHL schema requires locationId; other
+        endpoints (e.g. contact updates, media which scope by altId) send
+        none. A locationId the caller already set is left untouched.
         
-        self.last_request_time = time.time()
+        Args:
+            payload: Request body or query parameters
+        
+        Returns:
+            Dict: The same dict, with locationId set
+        """
+        payload.setdefault("locationId", self.location_id)
+        return payload
+    
+    def _parse_response(self, response) -> Dict:
+        """
+        Decode an HTTP response into the wrapper's return shape.
+        
+        Shared by the sync (requests) and async (httpx) transports, which both
+        expose status_code, content and text on their response objects.
+        
+        Args:
+            response: requests.Response or httpx.Response
+        
+        Returns:
+            Dict: Parsed JSON body, or a success marker for empty bodies
+        
+        Raises:
+            GoHighLevelAPIError: On non-2xx status codes
+        """
+        # Handle success responses
+        if response.status_code in [200, 201, 202, 204]:
+            if response.content:
+                try:
+                    return orjson.loads(response.content)
+                except orjson.JSONDecodeError:
+                    return {"success": True, "content": response.text}
+            return {"success": True}
+        
+        # Handle error responses (decode the body once)
+        error_msg = f"API request failed with status {response.status_code}"
+        try:
+            error_data = orjson.loads(response.content) if response.content else None
+        except orjson.JSONDecodeError:
+            error_data = None
+        
+        if isinstance(error_data, dict) and "message" in error_data:
+            error_msg = error_data["message"]
+        elif isinstance(error_data, dict) and "error" in error_data:
+            error_msg = error_data["error"]
+        else:
+            error_msg += f": {response.text}"
+        
+        raise GoHighLevelAPIError(
+            message=error_msg,
+            status_code=response.status_code,
+            response_data=error_data
+        )
     
     def _make_request(
         self,
@@ -162,6 +490,10 @@ class GoHighLevelAPI:
         """
         Make HTTP request to GoHighLevel API.
         
+        Transient failures (429/5xx) are retried with exponential backoff.
+        Write requests carry one Idempotency-Key for all attempts so the API
+        can drop duplicates of a retried POST/PUT.
+        
         Args:
             method: HTTP method (GET, POST, PUT, DELETE, PATCH)
             endpoint: API endpoint path (e.g., "contacts/")
@@ -183,55 +515,73 @@ class GoHighLevelAPI:
             ...     data={"firstName": "John", "email": "john@test.com"}
             ... )
         """
-        self._rate_limit()
+        url = self.base_url + endpoint.lstrip('/')
         
-        url = urljoin(self.base_url, endpoint)
-        
-        # Merge headers
-        request_headers = dict(self.session.headers)
+        # Per-call header overrides only; the session merges in its defaults
+        # (auth, version, JSON content type) without copying them per call
+        request_headers = {}
+        if method.upper() in self.WRITE_METHODS:
+            request_headers["Idempotency-Key"] = uuid.uuid4().hex
         if headers:
             request_headers.update(headers)
         
-        # Remove Content-Type for multipart uploads
+        # Pre-serialize JSON bodies with orjson; stream multipart uploads
+        # from their file handles instead of buffering them in memory
         if files:
-            request_headers.pop('Content-Type', None)
+            body = MultipartEncoder(fields={**(data or {}), **files})
+            request_headers["Content-Type"] = body.content_type
+        else:
+            body = orjson.dumps(data) if data is not None else None
+        
+        prepared = self.session.prepare_request(requests.Request(
+            method=method,
+            url=url,
+            data=body,
+            params=params,
+            headers=request_headers or None
+        ))
+        
+        return self._send_prepared(prepared, self._request_attempts(files))
+    
+    def _send_prepared(
+        self,
+        prepared: requests.PreparedRequest,
+        attempts: int
+    ) -> Dict:
+        """
+        Send an already-prepared request with rate limiting and retries.
+        
+        The send / retry half of _make_request, which prepares the request
+        (URL encoding, header merge, body) once for all attempts.
+        
+        Args:
+            prepared: Request prepared against this client's session
+            attempts: Total send attempts allowed (see _request_attempts)
+        
+        Returns:
+            Dict: Parsed JSON response from API
+        
+        Raises:
+            GoHighLevelAPIError: On API errors or network failures
+        """
+        # session.send() skips Session.request's environment merge: apply the
+        # proxy / CA bundle (trust_env) and session verify / cert defaults here
+        settings = self.session.merge_environment_settings(prepared.url, {}, None, None, None)
         
         try:
-            response = self.session.request(
-                method=method,
-                url=url,
-                json=data if not files else None,
-                data=data if files else None,
-                params=params,
-                files=files,
-                headers=request_headers
-            )
-            
-            # Handle success responses
-            if response.status_code in [200, 201, 202, 204]:
-                if response.content:
-                    try:
-                        return response.json()
-                    except:
-                        return {"success": True, "content": response.text}
-                return {"success": True}
+            for attempt in range(attempts):
+                self._rate_limit()
+                
+                response = self.session.send(prepared, **settings)
+                
+                self._update_rate(response)
+                
+                if response.status_code not in self.RETRY_STATUS_CODES or attempt == attempts - 1:
+                    break
+                
+                time.sleep(self._retry_delay(attempt, response))
             
-            # Handle error responses
-            error_msg = f"API request failed with status {response.status_code}"
-            try:
-                error_data = response.json()
-                if "message" in error_data:
-                    error_msg = error_data["message"]
-                elif "error" in error_data:
-                    error_msg = error_data["error"]
-            except:
-                error_msg += f": {response.text}"
-            
-            raise GoHighLevelAPIError(
-                message=error_msg,
-                status_code=response.status_code,
-                response_data=response.json() if response.text else None
-            )
+            return self._parse_response(response)
         
         except requests.RequestException as e:
             raise GoHighLevelAPIError(f"Network error: {str(e)}")
@@ -303,35 +653,28 @@ class GoHighLevelAPI:
             ... )
             >>> print(f"Created post: {post['data']['id']}")
         """
-        data = {
-            "locationId": self.location_id,
+        # Optional parameters; only those explicitly passed (not None) are sent
+        optional_fields = (
+            ("imageUrl", image_url),
+            ("description", description),
+            ("imageAltText", image_alt_text),
+            ("categories", ",".join(categories) if categories is not None else None),
+            ("tags", ",".join(tags) if tags is not None else None),
+            ("author", author),
+            ("urlSlug", url_slug),
+            ("canonicalLink", canonical_link),
+            ("publishedAt", published_at)
+        )
+        
+        data = self._inject_location({
             "blogId": blog_id,
             "title": title,
             "rawHTML": raw_html,
-            "status": status
-        }
+            "status": status,
+            **{key: value for key, value in optional_fields if value is not None}
+        })
         
-        # Add optional parameters
-        if image_url:
-            data["imageUrl"] = image_url
-        if description:
-            data["description"] = description
-        if image_alt_text:
-            data["imageAltText"] = image_alt_text
-        if categories:
-            data["categories"] = ",".join(categories)
-        if tags:
-            data["tags"] = ",".join(tags)
-        if author:
-            data["author"] = author
-        if url_slug:
-            data["urlSlug"] = url_slug
-        if canonical_link:
-            data["canonicalLink"] = canonical_link
-        if published_at:
-            data["publishedAt"] = published_at
-        
-        return self._make_request("POST", "blogs/posts", data)
+        return self._make_request("POST", self._EP['create_blog_post'], data)
     
     def update_blog_post(
         self,
@@ -366,10 +709,10 @@ class GoHighLevelAPI:
             ...     tags=["new", "tags"]
             ... )
         """
-        data = {"locationId": self.location_id}
-        data.update(kwargs)
+        data = self._inject_location(dict(kwargs))
         
-        return self._make_request("PUT", f"blogs/posts/{post_id}", data)
+        endpoint = self._EP['update_blog_post'].format_map({'post_id': post_id})
+        return self._make_request("PUT", endpoint, data)
     
     def get_blog_posts(
         self,
@@ -416,20 +759,20 @@ class GoHighLevelAPI:
             >>> for post in posts['blogs']:
             ...     print(post['title'])
         """
-        params = {
-            "locationId": self.location_id,
+        params = self._inject_location({
             "blogId": blog_id,
             "limit": limit,
             "offset": offset
-        }
+        })
         
         if status:
             params["status"] = status
         if search_term:
             params["searchTerm"] = search_term
         
-        return self._make_request("GET", "blogs/posts/all", params=params)
+        return self._make_request("GET", self._EP['get_blog_posts'], params=params)
     
+    @_ttl_cached(30)
     def get_blogs_by_location(
         self,
         skip: int = 0,
@@ -441,6 +784,7 @@ class GoHighLevelAPI:
         
         Endpoint: GET /blogs/site/all
         Scope: blogs/list.readonly
+        Cached: 30 seconds per client (see clear_cache)
         
         Args:
             skip: Number of blogs to skip (default 0)
@@ -464,16 +808,15 @@ class GoHighLevelAPI:
             >>> blogs = api.get_blogs_by_location()
             >>> blog_id = blogs['data'][0]['id']
         """
-        params = {
-            "locationId": self.location_id,
+        params = self._inject_location({
             "skip": skip,
             "limit": limit
-        }
+        })
         
         if search_term:
             params["searchTerm"] = search_term
         
-        return self._make_request("GET", "blogs/site/all", params=params)
+        return self._make_request("GET", self._EP['get_blogs_by_location'], params=params)
     
     def check_url_slug_exists(
         self,
@@ -501,16 +844,16 @@ class GoHighLevelAPI:
             >>> if result['exists']:
             ...     print("Slug already taken!")
         """
-        params = {
-            "locationId": self.location_id,
+        params = self._inject_location({
             "urlSlug": url_slug
-        }
+        })
         
         if post_id:
             params["postId"] = post_id
         
-        return self._make_request("GET", "blogs/posts/url-slug-exists", params=params)
+        return self._make_request("GET", self._EP['check_url_slug_exists'], params=params)
     
+    @_ttl_cached(30)
     def get_blog_authors(
         self,
         limit: int = 20,
@@ -521,6 +864,7 @@ class GoHighLevelAPI:
         
         Endpoint: GET /blogs/authors
         Scope: blogs/author.readonly
+        Cached: 30 seconds per client (see clear_cache)
         
         Args:
             limit: Number of authors to return (default 20)
@@ -543,14 +887,14 @@ class GoHighLevelAPI:
             >>> authors = api.get_blog_authors()
             >>> author_id = authors['authors'][0]['id']
         """
-        params = {
-            "locationId": self.location_id,
+        params = self._inject_location({
             "limit": limit,
             "offset": offset
-        }
+        })
         
-        return self._make_request("GET", "blogs/authors", params=params)
+        return self._make_request("GET", self._EP['get_blog_authors'], params=params)
     
+    @_ttl_cached(30)
     def get_blog_categories(
         self,
         limit: int = 50,
@@ -561,6 +905,7 @@ class GoHighLevelAPI:
         
         Endpoint: GET /blogs/categories
         Scope: blogs/category.readonly
+        Cached: 30 seconds per client (see clear_cache)
         
         Args:
             limit: Number of categories to return (default 50)
@@ -582,13 +927,12 @@ class GoHighLevelAPI:
             >>> categories = api.get_blog_categories()
             >>> cat_ids = [c['id'] for c in categories['categories']]
         """
-        params = {
-            "locationId": self.location_id,
+        params = self._inject_location({
             "limit": limit,
             "offset": offset
-        }
+        })
         
-        return self._make_request("GET", "blogs/categories", params=params)
+        return self._make_request("GET", self._EP['get_blog_categories'], params=params)
     
     def delete_blog_post(
         self,
@@ -609,7 +953,8 @@ class GoHighLevelAPI:
         Example:
             >>> api.delete_blog_post("post_abc123")
         """
-        return self._make_request("DELETE", f"blogs/posts/{post_id}")
+        endpoint = self._EP['delete_blog_post'].format_map({'post_id': post_id})
+        return self._make_request("DELETE", endpoint)
     
     # =====================================================================
     # MEDIA ENDPOINTS
@@ -660,17 +1005,15 @@ class GoHighLevelAPI:
         
         file_name = name or Path(file_path).name
         
-        files = {
-            'file': (file_name, open(file_path, 'rb'), 'application/octet-stream')
-        }
-        
         data = {}
         if name:
             data['name'] = name
         if parent_id:
             data['parentId'] = parent_id
         
-        return self._make_request("POST", "medias/upload-file", data=data, files=files)
+        with open(file_path, 'rb') as f:
+            files = {'file': (file_name, f, 'application/octet-stream')}
+            return self._make_request("POST", self._EP['upload_media_file'], data=data, files=files)
     
     def get_media_files(
         self,
@@ -728,7 +1071,7 @@ class GoHighLevelAPI:
         if query:
             params["query"] = query
         
-        return self._make_request("GET", "medias/files", params=params)
+        return self._make_request("GET", self._EP['get_media_files'], params=params)
     
     def delete_media_file(
         self,
@@ -754,7 +1097,8 @@ class GoHighLevelAPI:
             "altId": self.location_id
         }
         
-        return self._make_request("DELETE", f"medias/{file_id}", params=params)
+        endpoint = self._EP['delete_media_file'].format_map({'file_id': file_id})
+        return self._make_request("DELETE", endpoint, params=params)
     
     # =====================================================================
     # FORMS ENDPOINTS
@@ -812,11 +1156,10 @@ class GoHighLevelAPI:
             >>> for sub in submissions['submissions']:
             ...     print(f"Contact: {sub['contactId']}")
         """
-        params = {
-            "locationId": self.location_id,
+        params = self._inject_location({
             "page": page,
             "limit": limit
-        }
+        })
         
         if form_id:
             params["formId"] = form_id
@@ -827,8 +1170,9 @@ class GoHighLevelAPI:
         if end_at:
             params["endAt"] = end_at
         
-        return self._make_request("GET", "forms/submissions", params=params)
+        return self._make_request("GET", self._EP['get_form_submissions'], params=params)
     
+    @_ttl_cached(30)
     def get_forms(
         self,
         skip: int = 0,
@@ -840,6 +1184,7 @@ class GoHighLevelAPI:
         
         Endpoint: GET /forms/
         Scope: forms.readonly
+        Cached: 30 seconds per client (see clear_cache)
         
         Args:
             skip: Number of forms to skip (default 0)
@@ -854,16 +1199,15 @@ class GoHighLevelAPI:
             >>> for form in forms['forms']:
             ...     print(f"{form['name']}: {form['id']}")
         """
-        params = {
-            "locationId": self.location_id,
+        params = self._inject_location({
             "skip": skip,
             "limit": limit
-        }
+        })
         
         if type_filter:
             params["type"] = type_filter
         
-        return self._make_request("GET", "forms/", params=params)
+        return self._make_request("GET", self._EP['get_forms'], params=params)
     
     # =====================================================================
     # CONTACTS ENDPOINTS
@@ -882,7 +1226,7 @@ class GoHighLevelAPI:
         country: Optional[str] = None,
         company_name: Optional[str] = None,
         website: Optional[str] = None,
-        tags: Optional[List[str]] = None,
+        tags: Optional[Union[List[str], str]] = None,
         source: Optional[str] = None,
         custom_fields: Optional[Dict] = None,
         **kwargs
@@ -905,7 +1249,7 @@ class GoHighLevelAPI:
             country: Country name
             company_name: Company name
             website: Website URL
-            tags: List of tag strings
+            tags: List of tag strings (or an already comma-joined string)
             source: Source of the contact
             custom_fields: Dict of custom field key-value pairs
             **kwargs: Additional fields
@@ -933,40 +1277,31 @@ class GoHighLevelAPI:
             ... )
             >>> contact_id = contact['contact']['id']
         """
-        data = {"locationId": self.location_id}
-        
-        if first_name:
-            data["firstName"] = first_name
-        if last_name:
-            data["lastName"] = last_name
-        if email:
-            data["email"] = email
-        if phone:
-            data["phone"] = phone
-        if address1:
-            data["address1"] = address1
-        if city:
-            data["city"] = city
-        if state:
-            data["state"] = state
-        if postal_code:
-            data["postalCode"] = postal_code
-        if country:
-            data["country"] = country
-        if company_name:
-            data["companyName"] = company_name
-        if website:
-            data["website"] = website
-        if tags:
-            data["tags"] = ",".join(tags)
-        if source:
-            data["source"] = source
-        if custom_fields:
-            data["customFields"] = json.dumps(custom_fields)
+        # Only fields explicitly passed (not None) are sent
+        fields = (
+            ("firstName", first_name),
+            ("lastName", last_name),
+            ("email", email),
+            ("phone", phone),
+            ("address1", address1),
+            ("city", city),
+            ("state", state),
+            ("postalCode", postal_code),
+            ("country", country),
+            ("companyName", company_name),
+            ("website", website),
+            ("tags", tags if tags is None or isinstance(tags, str) else ",".join(tags)),
+            ("source", source),
+            ("customFields", orjson.dumps(custom_fields).decode() if custom_fields is not None else None)
+        )
+        
+        data = self._inject_location({
+            **{key: value for key, value in fields if value is not None}
+        })
         
         data.update(kwargs)
         
-        return self._make_request("POST", "contacts/", data)
+        return self._make_request("POST", self._EP['create_contact'], data)
     
     def get_contact(
         self,
@@ -988,7 +1323,8 @@ class GoHighLevelAPI:
             >>> contact = api.get_contact("contact_abc123")
             >>> print(contact['contact']['email'])
         """
-        return self._make_request("GET", f"contacts/{contact_id}")
+        endpoint = self._EP['get_contact'].format_map({'contact_id': contact_id})
+        return self._make_request("GET", endpoint)
     
     def update_contact(
         self,
@@ -1016,7 +1352,8 @@ class GoHighLevelAPI:
             ... )
         """
         data = kwargs
-        return self._make_request("PUT", f"contacts/{contact_id}", data)
+        endpoint = self._EP['update_contact'].format_map({'contact_id': contact_id})
+        return self._make_request("PUT", endpoint, data)
     
     def delete_contact(
         self,
@@ -1037,7 +1374,8 @@ class GoHighLevelAPI:
         Example:
             >>> api.delete_contact("contact_abc123")
         """
-        return self._make_request("DELETE", f"contacts/{contact_id}")
+        endpoint = self._EP['delete_contact'].format_map({'contact_id': contact_id})
+        return self._make_request("DELETE", endpoint)
     
     def search_contacts(
         self,
@@ -1069,18 +1407,217 @@ class GoHighLevelAPI:
             >>> for contact in results['contacts']:
             ...     print(contact['email'])
         """
-        params = {
-            "locationId": self.location_id,
+        params = self._inject_location({
             "limit": limit,
             "offset": offset
-        }
+        })
         
         if query:
             params["query"] = query
         
         params.update(filters)
         
-        return self._make_request("GET", "contacts/", params=params)
+        return self._make_request("GET", self._EP['search_contacts'], params=params)
+    
+    # =====================================================================
+    # PAGINATION HELPERS
+    # =====================================================================
+    
+    def _collect_pages(
+        self,
+        fetch_page,
+        items_key: str,
+        page_size: int,
+        total_of,
+        is_last_page=None
+    ) -> List[Dict]:
+        """
+        Fetch every page of a list endpoint, concurrently when possible.
+        
+        The first page is fetched alone to learn the total; the remaining
+        pages are then requested on a thread pool sharing this client's
+        session and rate limiter. Endpoints that don't report a total are
+        walked sequentially until is_last_page (default: a short page).
+        
+        Args:
+            fetch_page: Callable taking a zero-based page index, returning a response
+            items_key: Response key holding the page's items (e.g. "blogs")
+            page_size: Number of items requested per page
+            total_of: Callable extracting the total item count from a response (or None)
+            is_last_page: Optional callable (response, page items) -> bool ending
+                the sequential walk; defaults to a page shorter than page_size
+        
+        Returns:
+            List[Dict]: All items in page order
+        """
+        first = fetch_page(0)
+        items = list(first.get(items_key, []))
+        total = total_of(first)
+        
+        if total is not None:
+            page_count = math.ceil(total / page_size)
+            with ThreadPoolExecutor(max_workers=self.PAGE_FETCH_WORKERS) as executor:
+                for page in executor.map(fetch_page, range(1, page_count)):
+                    items.extend(page.get(items_key, []))
+            return items
+        
+        if is_last_page is None:
+            is_last_page = lambda response, page_items: len(page_items) < page_size
+        response, page_items = first, first.get(items_key, [])
+        index = 1
+        while page_items and not is_last_page(response, page_items):
+            response = fetch_page(index)
+            page_items = response.get(items_key, [])
+            items.extend(page_items)
+            index += 1
+        
+        return items
+    
+    def get_blog_posts_all(
+        self,
+        blog_id: str,
+        status: Optional[str] = None,
+        page_size: int = 100
+    ) -> List[Dict]:
+        """
+        Get ALL blog posts for a blog, fetching pages concurrently.
+        
+        On GoHighLevelAsyncAPI this is a coroutine that uses asyncio.gather.
+        
+        Args:
+            blog_id: Blog site ID
+            status: Optional status filter
+            page_size: Posts per page (max 100)
+        
+        Returns:
+            List[Dict]: List of all blog posts
+        
+        Example:
+            >>> posts = api.get_blog_posts_all("blog_123", status="PUBLISHED")
+        """
+        return self._collect_pages(
+            lambda i: self.get_blog_posts(
+                blog_id=blog_id,
+                limit=page_size,
+                offset=i * page_size,
+                status=status
+            ),
+            "blogs",
+            page_size,
+            lambda response: response.get('total'),
+            lambda response, posts: self._is_last_page(response, posts, page_size)
+        )
+    
+    def get_media_files_all(
+        self,
+        file_type: str = "file",
+        parent_id: Optional[str] = None,
+        query: Optional[str] = None,
+        page_size: int = 100
+    ) -> List[Dict]:
+        """
+        Get ALL files/folders from media storage.
+        
+        When the response reports a total, the remaining pages are fetched
+        concurrently; otherwise pages are walked in order until a short page
+        is returned.
+        
+        Args:
+            file_type: "file" or "folder" (default "file")
+            parent_id: Filter by parent folder ID
+            query: Search query for file names
+            page_size: Files per page
+        
+        Returns:
+            List[Dict]: List of all matching files
+        """
+        return self._collect_pages(
+            lambda i: self.get_media_files(
+                offset=i * page_size,
+                limit=page_size,
+                file_type=file_type,
+                parent_id=parent_id,
+                query=query
+            ),
+            "files",
+            page_size,
+            lambda response: response.get('total')
+        )
+    
+    def get_form_submissions_all(
+        self,
+        form_id: Optional[str] = None,
+        query: Optional[str] = None,
+        start_at: Optional[str] = None,
+        end_at: Optional[str] = None,
+        page_size: int = 100
+    ) -> List[Dict]:
+        """
+        Get ALL form submissions, fetching pages concurrently.
+        
+        Args:
+            form_id: Filter by specific form ID
+            query: Search by contactId, name, email, or phone
+            start_at: Start date filter (YYYY-MM-DD format)
+            end_at: End date filter (YYYY-MM-DD format)
+            page_size: Submissions per page (max 100)
+        
+        Returns:
+            List[Dict]: List of all submissions
+        """
+        return self._collect_pages(
+            lambda i: self.get_form_submissions(
+                page=i + 1,
+                limit=page_size,
+                form_id=form_id,
+                query=query,
+                start_at=start_at,
+                end_at=end_at
+            ),
+            "submissions",
+            page_size,
+            lambda response: response.get('meta', {}).get('total')
+        )
+    
+    def get_blog_authors_all(
+        self,
+        page_size: int = 100
+    ) -> List[Dict]:
+        """
+        Get ALL blog authors for the location.
+        
+        Args:
+            page_size: Authors per page
+        
+        Returns:
+            List[Dict]: List of all authors
+        """
+        return self._collect_pages(
+            lambda i: self.get_blog_authors(limit=page_size, offset=i * page_size),
+            "authors",
+            page_size,
+            lambda response: response.get('total')
+        )
+    
+    def get_blog_categories_all(
+        self,
+        page_size: int = 100
+    ) -> List[Dict]:
+        """
+        Get ALL blog categories for the location.
+        
+        Args:
+            page_size: Categories per page
+        
+        Returns:
+            List[Dict]: List of all categories
+        """
+        return self._collect_pages(
+            lambda i: self.get_blog_categories(limit=page_size, offset=i * page_size),
+            "categories",
+            page_size,
+            lambda response: response.get('total')
+        )
     
     # =====================================================================
     # UTILITY METHODS
@@ -1115,17 +1652,21 @@ class GoHighLevelAPI:
             >>> print(slug)
             'medicare-medicaid-whats-the-difference'
         """
+        if title.isascii():
+            # Lowercase, strip and space->hyphen in one C-level pass
+            return _SLUG_DASHES.sub('-', title.translate(_SLUG_TABLE)).strip('-')
+        
         # Convert to lowercase
         slug = title.lower()
         
         # Remove special characters (keep alphanumeric, spaces, and hyphens)
-        slug = re.sub(r'[^a-z0-9\s-]', '', slug)
+        slug = _SLUG_STRIP.sub('', slug)
         
         # Replace spaces with hyphens
-        slug = re.sub(r'\s+', '-', slug)
+        slug = _SLUG_SPACES.sub('-', slug)
         
         # Remove consecutive hyphens
-        slug = re.sub(r'-+', '-', slug)
+        slug = _SLUG_DASHES.sub('-', slug)
         
         # Trim hyphens from ends
         slug = slug.strip('-')
@@ -1142,7 +1683,10 @@ class GoHighLevelAPI:
         Ensure a slug is unique by appending a number if necessary.
         
         This utility checks if a slug exists and appends -1, -2, etc. until
-        a unique slug is found.
+        a unique slug is found. The base slug is checked on its own; after a
+        conflict, SLUG_PROBE_BATCH variants are checked concurrently per
+        round. Slugs found taken are remembered per client, so bulk imports
+        of similar titles skip them without another request.
         
         Args:
             slug: The desired slug
@@ -1161,22 +1705,59 @@ class GoHighLevelAPI:
             >>> # If "my-blog-post" exists, returns "my-blog-post-1"
             >>> # If that exists too, returns "my-blog-post-2", etc.
         """
-        original_slug = slug
-        counter = 1
+        candidates = self._slug_candidates(slug, post_id, max_attempts)
         
-        while counter <= max_attempts:
-            result = self.check_url_slug_exists(slug, post_id)
+        # Base slug alone first (usually free), then concurrent rounds
+        batch = 1
+        while candidates:
+            window, candidates = candidates[:batch], candidates[batch:]
             
-            if not result.get('exists', False):
-                return slug
+            if len(window) == 1:
+                results = [self.check_url_slug_exists(window[0], post_id)]
+            else:
+                with ThreadPoolExecutor(max_workers=len(window)) as executor:
+                    results = list(executor.map(
+                        lambda candidate: self.check_url_slug_exists(candidate, post_id),
+                        window
+                    ))
             
-            slug = f"{original_slug}-{counter}"
-            counter += 1
+            free = self._first_free_slug(window, results, post_id)
+            if free is not None:
+                return free
+            batch = self.SLUG_PROBE_BATCH
         
         raise GoHighLevelAPIError(
             f"Unable to generate unique slug after {max_attempts} attempts"
         )
     
+    def _slug_candidates(
+        self,
+        slug: str,
+        post_id: Optional[str],
+        max_attempts: int
+    ) -> List[str]:
+        """Slugs ensure_unique_slug may try, in order, minus known-taken ones."""
+        candidates = [slug] + [f"{slug}-{n}" for n in range(1, max_attempts)]
+        
+        # With post_id the answer depends on the post, so skip the cache
+        if post_id is None:
+            candidates = [c for c in candidates if c not in self._taken_slugs]
+        return candidates
+    
+    def _first_free_slug(
+        self,
+        window: List[str],
+        results: List[Dict],
+        post_id: Optional[str]
+    ) -> Optional[str]:
+        """Return the first free slug of a checked window, remembering taken ones."""
+        for candidate, result in zip(window, results):
+            if not result.get('exists', False):
+                return candidate
+            if post_id is None:
+                self._taken_slugs.add(candidate)
+        return None
+    
     def batch_upload_images(
         self,
         image_paths: List[str],
@@ -1209,25 +1790,29 @@ class GoHighLevelAPI:
             >>> results = api.batch_upload_images(images)
             >>> image_urls = [r['url'] for r in results]
         """
-        results = []
+        if not image_paths:
+            return []
         
-        for path in image_paths:
+        def upload(path: str) -> Dict:
             try:
                 result = self.upload_media_file(path, parent_id=parent_id)
-                results.append({
+                return {
                     "path": path,
                     "url": result.get('url'),
                     "fileId": result.get('fileId'),
                     "success": True
-                })
+                }
             except Exception as e:
-                results.append({
+                return {
                     "path": path,
                     "success": False,
                     "error": str(e)
-                })
+                }
         
-        return results
+        # Uploads overlap over the pooled session; map keeps input order
+        workers = min(self.UPLOAD_WORKERS, len(image_paths))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(upload, image_paths))
     
     def create_blog_post_from_dict(
         self,
@@ -1302,32 +1887,26 @@ class GoHighLevelAPI:
             ...     status="PUBLISHED"
             ... )
         """
-        all_posts = []
-        offset = 0
-        limit = 100
-        
-        while True:
-            response = self.get_blog_posts(
-                blog_id=blog_id,
-                limit=limit,
-                offset=offset,
-                status=status
-            )
-            
-            posts = response.get('blogs', [])
-            if not posts:
-                break
-            
-            all_posts.extend(posts)
-            
-            # Check if we have more
-            if len(posts) < limit:
-                break
-            
-            offset += limit
+        return self.get_blog_posts_all(blog_id, status=status)
+    
+    @staticmethod
+    def _is_last_page(response: Dict, items: List, limit: int) -> bool:
+        """
+        Whether an offset page is the final one.
         
-        return all_posts
+        Prefers an explicit hasMore / nextPage marker (top level or in meta)
+        so a total that is an exact multiple of limit doesn't cost an extra
+        empty request; falls back to the short-page check otherwise.
+        """
+        meta = response.get('meta') or {}
+        for source in (response, meta):
+            if source.get('hasMore') is not None:
+                return not source['hasMore']
+            if 'nextPage' in source:
+                return not source['nextPage']
+        return len(items) < limit
     
+    @_ttl_cached(600)
     def validate_image_url(
         self,
         url: str
@@ -1338,6 +1917,8 @@ class GoHighLevelAPI:
         This utility checks if an image URL is valid before using it
         in a blog post.
         
+        Cached: 10 minutes per client and URL (see clear_cache)
+        
         Args:
             url: Image URL to validate
         
@@ -1353,7 +1934,7 @@ class GoHighLevelAPI:
             ...     pass
         """
         try:
-            response = requests.head(url, timeout=5)
+            response = self._asset_session.head(url, timeout=5)
             content_type = response.headers.get('Content-Type', '')
             return (
                 response.status_code == 200 and 
@@ -1390,7 +1971,7 @@ class GoHighLevelAPI:
             '+447911123456'
         """
         # Remove all non-numeric characters
-        digits = re.sub(r'\D', '', phone)
+        digits = _NON_DIGITS.sub('', phone)
         
         # Add country code if not present
         if not digits.startswith(country_code):
@@ -1399,6 +1980,341 @@ class GoHighLevelAPI:
         return f"+{digits}"
 
 
+class GoHighLevelAsyncAPI(GoHighLevelAPI):
+    """
+    Asynchronous GoHighLevel API v2.0 Wrapper built on httpx.AsyncClient.
+    
+    Every endpoint method inherited from GoHighLevelAPI returns an awaitable
+    here, because each one resolves to ``self._make_request(...)`` and this
+    class makes that coroutine-based. The ``*_all`` pagination helpers work
+    the same way through ``_collect_pages``. Independent calls can therefore be
+    overlapped with ``asyncio.gather`` instead of paying one round trip each.
+    
+    The client uses a single pooled HTTP/2 connection pool, so bursts of
+    concurrent requests are multiplexed over few TCP connections.
+    
+    Attributes:
+        location_id (str): GoHighLevel location/sub-account ID
+        api_key (str): API authentication token (Bearer)
+        base_url (str): API base URL
+        client (httpx.AsyncClient): Persistent async HTTP client
+    
+    Example:
+        >>> async def main():
+        ...     async with GoHighLevelAsyncAPI("loc_123", "api_key_456") as api:
+        ...         contact, posts = await asyncio.gather(
+        ...             api.get_contact("contact_abc123"),
+        ...             api.get_blog_posts_all("blog_123")
+        ...         )
+        >>> asyncio.run(main())
+    """
+    
+    def __init__(
+        self, 
+        location_id: str, 
+        api_key: str, 
+        base_url: str = "https://services.leadconnectorhq.com",
+        max_retries: int = 3,
+        max_connections: int = 50,
+        max_keepalive_connections: int = 20
+    ):
+        """
+        Initialize async GoHighLevel API client.
+        
+        Args:
+            location_id: The GoHighLevel location ID (found in Settings > API)
+            api_key: API authentication key (Bearer token)
+            base_url: API base URL (default: official production URL)
+            max_retries: Retries for 429/5xx responses before raising (default 3)
+            max_connections: Maximum concurrent connections in the pool
+            max_keepalive_connections: Idle connections kept open for reuse
+        """
+        super().__init__(location_id, api_key, base_url, max_retries)
+        
+        # Content-Type is set per request so multipart uploads get their own
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Version": "2021-07-28",
+                "Accept": "application/json"
+            },
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections
+            )
+        )
+        
+        # Header-less pooled client for third-party URLs (image checks), so
+        # the API bearer token never goes to other hosts; created on first use
+        self._asset_client = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+    
+    async def aclose(self):
+        """Close the underlying HTTP clients and their connection pools."""
+        await self.client.aclose()
+        if self._asset_client is not None:
+            await self._asset_client.aclose()
+            self._asset_client = None
+    
+    def _get_asset_client(self) -> httpx.AsyncClient:
+        """The shared asset client (image checks), created on first use."""
+        if self._asset_client is None:
+            self._asset_client = httpx.AsyncClient(timeout=5)
+        return self._asset_client
+    
+    async def _cache_store(self, key: tuple, response) -> Dict:
+        """Await a fresh response, store it for _ttl_cached, return a copy."""
+        return super()._cache_store(key, await response)
+    
+    async def _cached_return(self, response: Dict) -> Dict:
+        """Return a copy of a cached response as an awaitable."""
+        return copy.deepcopy(response)
+    
+    async def _rate_limit(self):
+        """Wait for a rate-limit token without blocking the event loop."""
+        wait = self._reserve_token()
+        
+        if wait > 0:
+            await asyncio.sleep(wait)
+    
+    async def _make_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+        files: Optional[Dict] = None,
+        headers: Optional[Dict] = None
+    ) -> Dict:
+        """
+        Make an async HTTP request to GoHighLevel API.
+        
+        Same contract as GoHighLevelAPI._make_request, but must be awaited.
+        
+        Raises:
+            GoHighLevelAPIError: On API errors or network failures
+        """
+        request_headers = {}
+        if method.upper() in self.WRITE_METHODS:
+            request_headers["Idempotency-Key"] = uuid.uuid4().hex
+        if headers:
+            request_headers.update(headers)
+        
+        # Multipart bodies let httpx set their own boundary Content-Type;
+        # only JSON bodies need one, so bodiless GETs send no overrides
+        content = None
+        form_data = None
+        if files:
+            form_data = data
+        elif data is not None:
+            content = orjson.dumps(data)
+            request_headers["Content-Type"] = "application/json"
+        
+        attempts = self._request_attempts(files)
+        
+        for attempt in range(attempts):
+            await self._rate_limit()
+            
+            try:
+                response = await self.client.request(
+                    method,
+                    endpoint,
+                    content=content,
+                    data=form_data,
+                    files=files,
+                    params=params,
+                    headers=request_headers or None
+                )
+            except httpx.HTTPError as e:
+                raise GoHighLevelAPIError(f"Network error: {str(e)}")
+            
+            self._update_rate(response)
+            
+            if response.status_code not in self.RETRY_STATUS_CODES or attempt == attempts - 1:
+                break
+            
+            await asyncio.sleep(self._retry_delay(attempt, response))
+        
+        return self._parse_response(response)
+    
+    # =====================================================================
+    # ASYNC PAGINATION HELPERS
+    # =====================================================================
+    
+    async def _collect_pages(
+        self,
+        fetch_page,
+        items_key: str,
+        page_size: int,
+        total_of,
+        is_last_page=None
+    ) -> List[Dict]:
+        """
+        Fetch every page of a list endpoint, concurrently when possible.
+        
+        The first page is fetched alone to learn the total; the remaining
+        pages are then requested together with asyncio.gather. Endpoints
+        that don't report a total are walked sequentially until is_last_page
+        (default: a short page).
+        
+        Args:
+            fetch_page: Callable taking a zero-based page index, returning an awaitable response
+            items_key: Response key holding the page's items (e.g. "blogs")
+            page_size: Number of items requested per page
+            total_of: Callable extracting the total item count from a response (or None)
+            is_last_page: Optional callable (response, page items) -> bool ending
+                the sequential walk; defaults to a page shorter than page_size
+        
+        Returns:
+            List[Dict]: All items in page order
+        """
+        first = await fetch_page(0)
+        items = list(first.get(items_key, []))
+        total = total_of(first)
+        
+        if total is not None:
+            page_count = math.ceil(total / page_size)
+            pages = await asyncio.gather(*[fetch_page(i) for i in range(1, page_count)])
+            for page in pages:
+                items.extend(page.get(items_key, []))
+            return items
+        
+        if is_last_page is None:
+            is_last_page = lambda response, page_items: len(page_items) < page_size
+        response, page_items = first, first.get(items_key, [])
+        index = 1
+        while page_items and not is_last_page(response, page_items):
+            response = await fetch_page(index)
+            page_items = response.get(items_key, [])
+            items.extend(page_items)
+            index += 1
+        
+        return items
+    
+    # =====================================================================
+    # ASYNC UTILITY METHODS
+    # =====================================================================
+    
+    async def upload_media_file(
+        self,
+        file_path: str,
+        name: Optional[str] = None,
+        parent_id: Optional[str] = None
+    ) -> Dict:
+        """Async version of GoHighLevelAPI.upload_media_file."""
+        if not Path(file_path).exists():
+            raise GoHighLevelAPIError(f"File not found: {file_path}")
+        
+        file_name = name or Path(file_path).name
+        
+        data = {}
+        if name:
+            data['name'] = name
+        if parent_id:
+            data['parentId'] = parent_id
+        
+        # Keep the handle open until httpx has streamed the body
+        with open(file_path, 'rb') as f:
+            files = {'file': (file_name, f, 'application/octet-stream')}
+            return await self._make_request("POST", self._EP['upload_media_file'], data=data, files=files)
+    
+    async def ensure_unique_slug(
+        self,
+        slug: str,
+        post_id: Optional[str] = None,
+        max_attempts: int = 100
+    ) -> str:
+        """Async version of GoHighLevelAPI.ensure_unique_slug."""
+        candidates = self._slug_candidates(slug, post_id, max_attempts)
+        
+        batch = 1
+        while candidates:
+            window, candidates = candidates[:batch], candidates[batch:]
+            
+            results = await asyncio.gather(*(
+                self.check_url_slug_exists(candidate, post_id) for candidate in window
+            ))
+            
+            free = self._first_free_slug(window, results, post_id)
+            if free is not None:
+                return free
+            batch = self.SLUG_PROBE_BATCH
+        
+        raise GoHighLevelAPIError(
+            f"Unable to generate unique slug after {max_attempts} attempts"
+        )
+    
+    async def batch_upload_images(
+        self,
+        image_paths: List[str],
+        parent_id: Optional[str] = None
+    ) -> List[Dict]:
+        """Async version of GoHighLevelAPI.batch_upload_images."""
+        async def upload(path: str) -> Dict:
+            try:
+                result = await self.upload_media_file(path, parent_id=parent_id)
+                return {
+                    "path": path,
+                    "url": result.get('url'),
+                    "fileId": result.get('fileId'),
+                    "success": True
+                }
+            except Exception as e:
+                return {
+                    "path": path,
+                    "success": False,
+                    "error": str(e)
+                }
+        
+        # All uploads in flight at once; the token bucket paces the sends
+        return list(await asyncio.gather(*(upload(path) for path in image_paths)))
+    
+    async def create_blog_post_from_dict(
+        self,
+        post_data: Dict
+    ) -> Dict:
+        """Async version of GoHighLevelAPI.create_blog_post_from_dict."""
+        if 'url_slug' not in post_data:
+            slug = self.generate_url_slug(post_data['title'])
+            post_data['url_slug'] = await self.ensure_unique_slug(slug)
+        
+        if 'content' in post_data and 'raw_html' not in post_data:
+            post_data['raw_html'] = post_data.pop('content')
+        
+        return await self.create_blog_post(**post_data)
+    
+    async def get_all_blog_posts(
+        self,
+        blog_id: str,
+        status: Optional[str] = None
+    ) -> List[Dict]:
+        """Async version of GoHighLevelAPI.get_all_blog_posts."""
+        return await self.get_blog_posts_all(blog_id, status=status)
+    
+    @_ttl_cached(600)
+    async def validate_image_url(
+        self,
+        url: str
+    ) -> bool:
+        """Async version of GoHighLevelAPI.validate_image_url."""
+        try:
+            response = await self._get_asset_client().head(url)
+            content_type = response.headers.get('Content-Type', '')
+            return (
+                response.status_code == 200 and 
+                'image' in content_type.lower()
+            )
+        except httpx.HTTPError:
+            return False
+
+
 # Usage Examples and Testing
 if __name__ == "__main__":
     """
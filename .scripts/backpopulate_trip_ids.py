@@ -7,9 +7,14 @@ It reads from captured API responses to match passengers to trips.
 """
 
 import os
-import json
+import re
+import ijson
+import orjson
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from dotenv import load_dotenv
+from sqlalchemy import bindparam, func, select, update
 
 # Load environment variables
 load_dotenv()
@@ -27,7 +32,8 @@ if not os.path.exists(sync_captures_dir):
     print(f"\n❌ No sync captures found in {sync_captures_dir}")
     exit(1)
 
-captures = sorted([d for d in os.listdir(sync_captures_dir) if os.path.isdir(os.path.join(sync_captures_dir, d))])
+with os.scandir(sync_captures_dir) as entries:
+    captures = sorted(e.name for e in entries if e.is_dir())
 if not captures:
     print(f"\n❌ No capture directories found")
     exit(1)
@@ -35,80 +41,100 @@ if not captures:
 latest_capture = os.path.join(sync_captures_dir, captures[-1])
 print(f"\n📁 Using capture: {latest_capture}")
 
-# Load custom field definitions to get ID-to-key mapping
+# Load custom field definitions to get key-to-ID mapping
 custom_fields_file = os.path.join(latest_capture, '001_custom_fields_opportunity.json')
 if not os.path.exists(custom_fields_file):
     print(f"\n❌ Custom fields file not found")
     exit(1)
 
-with open(custom_fields_file, 'r') as f:
-    custom_fields_data = json.load(f)
+with open(custom_fields_file, 'rb') as f:
+    custom_fields_data = orjson.loads(f.read())
 
-# Build ID to fieldKey mapping
-field_id_to_key = {}
-for field in custom_fields_data.get('customFields', []):
-    field_id_to_key[field['id']] = field['fieldKey']
+# Build fieldKey to ID mapping
+field_key_to_id = {
+    field['fieldKey']: field['id']
+    for field in custom_fields_data.get('customFields', ())
+}
 
-print(f"\n✅ Loaded {len(field_id_to_key)} custom field mappings")
+print(f"\n✅ Loaded {len(field_key_to_id)} custom field mappings")
 
 # Find trip_id and trip_name field IDs
-trip_id_field_id = None
-trip_name_field_id = None
-for field_id, field_key in field_id_to_key.items():
-    if field_key == 'opportunity.trip_id':
-        trip_id_field_id = field_id
-        print(f"   Found trip_id field: {field_id}")
-    elif field_key == 'opportunity.trip_name':
-        trip_name_field_id = field_id
-        print(f"   Found trip_name field: {field_id}")
+trip_id_field_id = field_key_to_id.get('opportunity.trip_id')
+trip_name_field_id = field_key_to_id.get('opportunity.trip_name')
+if trip_id_field_id:
+    print(f"   Found trip_id field: {trip_id_field_id}")
+if trip_name_field_id:
+    print(f"   Found trip_name field: {trip_name_field_id}")
 
 if not trip_id_field_id and not trip_name_field_id:
     print("\n⚠️  No trip_id or trip_name fields found in custom fields")
     print("   Will try to match passengers to trips by other means...")
 
-# Load all passenger opportunities from captures
+# Stream passenger opportunities from captures, building the mapping of
+# passenger GHL ID to trip info as we go (one opportunity in memory at a time)
 print("\n📦 Loading passenger opportunities from captures...")
-passenger_opps = []
-for filename in sorted(os.listdir(latest_capture)):
-    if 'opportunities_fnsdpRtY9o83Vr4z15bE' in filename and filename.endswith('.json'):
-        filepath = os.path.join(latest_capture, filename)
-        with open(filepath, 'r') as f:
-            data = json.load(f)
-            passenger_opps.extend(data.get('opportunities', []))
-
-print(f"   ✅ Loaded {len(passenger_opps)} passenger opportunities")
-
-# Create mapping of passenger GHL ID to trip info
-passenger_trip_mapping = {}
-for opp in passenger_opps:
-    opp_id = opp.get('id')
-    custom_fields = opp.get('customFields', [])
-    
-    trip_id_value = None
-    trip_name_value = None
-    
-    # Extract trip info from custom fields
-    for cf in custom_fields:
-        if cf.get('id') == trip_id_field_id:
-            trip_id_value = cf.get('fieldValueString')
-        elif cf.get('id') == trip_name_field_id:
-            trip_name_value = cf.get('fieldValueString')
-    
-    if trip_id_value or trip_name_value:
-        passenger_trip_mapping[opp_id] = {
-            'trip_id_value': trip_id_value,
-            'trip_name_value': trip_name_value
-        }
+tid, tname = trip_id_field_id, trip_name_field_id
+
+
+def scan_opportunity_file(path):
+    """Return (opportunity count, {opp id: (trip_id_value, trip_name_value)}) for one capture file."""
+    count = 0
+    mapping = {}
+    with open(path, 'rb') as f:
+        for opp in ijson.items(f, 'opportunities.item'):
+            count += 1
+            custom_fields = opp.get('customFields')
+            if not custom_fields:
+                continue
+            
+            trip_id_value = None
+            trip_name_value = None
+            
+            # Extract trip info from custom fields, stopping once both are found
+            for cf in custom_fields:
+                cid = cf.get('id')
+                if cid == tid:
+                    trip_id_value = cf.get('fieldValueString')
+                elif cid == tname:
+                    trip_name_value = cf.get('fieldValueString')
+                if trip_id_value is not None and trip_name_value is not None:
+                    break
+            
+            if trip_id_value or trip_name_value:
+                mapping[opp.get('id')] = (trip_id_value, trip_name_value)
+    return count, mapping
 
+
+with os.scandir(latest_capture) as entries:
+    opportunity_paths = [
+        e.path for e in sorted(entries, key=lambda e: e.name)
+        if 'opportunities_fnsdpRtY9o83Vr4z15bE' in e.name and e.name.endswith('.json')
+    ]
+
+# Files are read concurrently; map() yields results in file order so later
+# captures still win for duplicate opportunity ids
+passenger_opp_count = 0
+passenger_trip_mapping = {}  # opp id -> (trip_id_value, trip_name_value)
+with ThreadPoolExecutor(max_workers=8) as executor:
+    for count, mapping in executor.map(scan_opportunity_file, opportunity_paths):
+        passenger_opp_count += count
+        passenger_trip_mapping.update(mapping)
+
+print(f"   ✅ Loaded {passenger_opp_count} passenger opportunities")
 print(f"   ✅ Found trip info for {len(passenger_trip_mapping)} passengers")
 
 # Now update the database
 with app.app_context():
     print("\n📊 Current Status:")
     
-    total_trips = Trip.query.count()
-    total_passengers = Passenger.query.count()
-    passengers_with_trip = Passenger.query.filter(Passenger.trip_id.isnot(None)).count()
+    # One round trip; COUNT(trip_id) skips NULLs, i.e. counts assigned passengers
+    total_trips, total_passengers, passengers_with_trip = db.session.execute(
+        select(
+            select(func.count(Trip.id)).scalar_subquery(),
+            select(func.count(Passenger.id)).scalar_subquery(),
+            select(func.count(Passenger.trip_id)).scalar_subquery()
+        )
+    ).one()
     passengers_without_trip = total_passengers - passengers_with_trip
     
     print(f"   Total Trips: {total_trips}")
@@ -123,9 +149,40 @@ with app.app_context():
     print("\n🔧 Attempting to match passengers to trips...")
     print("=" * 60)
     
-    unmatched_passengers = Passenger.query.filter(Passenger.trip_id.is_(None)).all()
+    # Only the columns the matcher needs; no ORM objects are loaded
+    unmatched_passengers = db.session.execute(
+        select(Passenger.id, Passenger.contact_id).where(Passenger.trip_id.is_(None))
+    ).all()
+    
+    # Preload trips once and match in memory instead of querying per passenger
+    all_trips = Trip.query.order_by(Trip.id).all()
+    trips_by_ghl_id = {t.ghl_opportunity_id: t for t in all_trips if t.ghl_opportunity_id}
+    trips_by_exact_name = {}
+    for t in all_trips:
+        # First trip whose name or destination matches wins, as with .first()
+        for value in (t.name, t.destination):
+            if value:
+                trips_by_exact_name.setdefault(value, t)
+    trips_lowered = [
+        ((t.name or '').lower(), (t.destination or '').lower(), t)
+        for t in all_trips
+    ]
+    
+    # Word index over lowercased names/destinations -> positions in trips_lowered
+    word_split = re.compile(r'\W+')
+    trips_by_lower_name = {}
+    trip_token_index = defaultdict(list)
+    for position, (name, destination, t) in enumerate(trips_lowered):
+        for value in (name, destination):
+            if value:
+                trips_by_lower_name.setdefault(value, t)
+        for token in set(word_split.split(f"{name} {destination}")):
+            if token:
+                trip_token_index[token].append(position)
     
     matched_count = 0
+    passenger_updates = []  # (passenger_id, trip_id)
+    now = datetime.utcnow()
     match_strategies = {
         'trip_ghl_id_exact': 0,
         'trip_name_exact': 0,
@@ -133,57 +190,79 @@ with app.app_context():
         'no_match': 0
     }
     
-    for passenger in unmatched_passengers:
+    for passenger_id, contact_id in unmatched_passengers:
         trip = None
         strategy = None
         
         # Get trip info from our mapping
-        trip_info = passenger_trip_mapping.get(passenger.id, {})
-        trip_id_value = trip_info.get('trip_id_value')
-        trip_name_value = trip_info.get('trip_name_value')
+        trip_id_value, trip_name_value = passenger_trip_mapping.get(passenger_id, (None, None))
         
         # Strategy 1: Match by GHL opportunity ID
         if trip_id_value:
-            trip = Trip.query.filter_by(ghl_opportunity_id=trip_id_value).first()
+            trip = trips_by_ghl_id.get(trip_id_value)
             if trip:
                 strategy = 'trip_ghl_id_exact'
         
         # Strategy 2: Exact match by trip name
         if not trip and trip_name_value and isinstance(trip_name_value, str) and len(trip_name_value) > 2:
-            trip = Trip.query.filter(
-                (Trip.name == trip_name_value) | (Trip.destination == trip_name_value)
-            ).first()
+            trip = trips_by_exact_name.get(trip_name_value)
             if trip:
                 strategy = 'trip_name_exact'
         
         # Strategy 3: Fuzzy match by trip name
         if not trip and trip_name_value and isinstance(trip_name_value, str) and len(trip_name_value) > 2:
-            trip = Trip.query.filter(
-                Trip.name.ilike(f"%{trip_name_value}%") | Trip.destination.ilike(f"%{trip_name_value}%")
-            ).first()
+            needle = trip_name_value.lower()
+            trip = trips_by_lower_name.get(needle)
+            
+            # Substring-check only trips sharing a word with the name first;
+            # scan everything only when none of them match (partial words)
+            if not trip:
+                candidates = sorted({
+                    position
+                    for token in word_split.split(needle) if token
+                    for position in trip_token_index.get(token, ())
+                })
+                trip = next(
+                    (t for name, destination, t in (trips_lowered[i] for i in candidates)
+                     if needle in name or needle in destination),
+                    None
+                )
+            if not trip:
+                trip = next(
+                    (t for name, destination, t in trips_lowered if needle in name or needle in destination),
+                    None
+                )
             if trip:
                 strategy = 'trip_name_fuzzy'
         
         # Update passenger if we found a match
         if trip:
-            passenger.trip_id = trip.id
-            passenger.updated_at = datetime.utcnow()
+            passenger_updates.append((passenger_id, trip.id))
             matched_count += 1
             match_strategies[strategy] += 1
             
-            contact = Contact.query.get(passenger.contact_id)
-            contact_name = f"{contact.firstname} {contact.lastname}" if contact else passenger.contact_id
-            
             if matched_count <= 10:  # Only print first 10 to avoid spam
+                contact = db.session.execute(
+                    select(Contact.firstname, Contact.lastname).where(Contact.id == contact_id)
+                ).first()
+                contact_name = f"{contact.firstname} {contact.lastname}" if contact else contact_id
                 print(f"   ✅ Matched: {contact_name} → {trip.name} (strategy: {strategy})")
         else:
             match_strategies['no_match'] += 1
             if match_strategies['no_match'] <= 5:  # Print first 5 failures
-                print(f"   ❌ No match for passenger {passenger.id} (trip_id: {trip_id_value}, trip_name: {trip_name_value})")
+                print(f"   ❌ No match for passenger {passenger_id} (trip_id: {trip_id_value}, trip_name: {trip_name_value})")
     
     # Commit changes
     if matched_count > 0:
         try:
+            # One executemany UPDATE; params are materialized only here
+            passengers = Passenger.__table__
+            db.session.execute(
+                update(passengers)
+                .where(passengers.c.id == bindparam('b_id'))
+                .values(trip_id=bindparam('b_trip_id'), updated_at=now),
+                [{'b_id': pid, 'b_trip_id': trip_id} for pid, trip_id in passenger_updates]
+            )
             db.session.commit()
             print(f"\n{'   ...' if matched_count > 10 else ''}")
             print("\n" + "=" * 60)
@@ -16,6 +16,9 @@ import sys
 import json
 from pathlib import Path
 from dotenv import load_dotenv
+from sqlalchemy import delete, text
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 # Load environment variables
 load_dotenv()
@@ -24,7 +27,7 @@ load_dotenv()
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from app import app, db
-from models import FieldMap
+from models import FieldMap, field_map_cached
 from ghl_api import GoHighLevelAPI
 
 
@@ -88,6 +91,26 @@ FIELD_KEY_TO_TABLE = {
 }
 
 
+def field_map_upsert():
+    """INSERT ... ON CONFLICT (ghl_key) DO UPDATE for field_maps on SQLite/Postgres"""
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        stmt = sqlite_insert(FieldMap.__table__)
+    elif dialect == 'postgresql':
+        stmt = postgresql_insert(FieldMap.__table__)
+    else:
+        raise RuntimeError(f"Field map upsert is not supported on {dialect}")
+    return stmt.on_conflict_do_update(
+        index_elements=['ghl_key'],
+        set_={
+            'field_key': stmt.excluded.field_key,
+            'table_column': stmt.excluded.table_column,
+            'tablename': stmt.excluded.tablename,
+            'data_type': stmt.excluded.data_type
+        }
+    )
+
+
 def save_json(data, filename):
     """Save data to JSON file"""
     filepath = Path(filename)
@@ -124,7 +147,8 @@ def main():
         # 1. Fetch custom field definitions from GHL
         print("1️⃣  Fetching custom field definitions from GHL...")
         try:
-            response = api.get_custom_fields(model='opportunity')
+            # Reuses a copy up to an hour old (.cache/) so re-runs skip the API
+            response = api.get_custom_fields_cached(model='opportunity')
             custom_fields = response.get('customFields', [])
             
             # Save response for inspection
@@ -150,67 +174,70 @@ def main():
             print(f"     ID: {field_id}")
             print()
         
-        # 3. Clear existing field maps
-        print("3️⃣  Clearing existing field maps...")
-        try:
-            FieldMap.query.delete()
-            db.session.commit()
-            print("   ✅ Cleared old mappings")
-        except Exception as e:
-            print(f"❌ Error clearing field maps: {e}")
-            db.session.rollback()
-            sys.exit(1)
-        
-        print()
+        # One-shot rebuild: on SQLite, use WAL and skip fsync. The upsert and
+        # the stale-row cleanup share one transaction (one connection) and one COMMIT.
+        if db.engine.dialect.name == 'sqlite':
+            db.session.execute(text('PRAGMA journal_mode=WAL'))
+            db.session.execute(text('PRAGMA synchronous=OFF'))
         
-        # 4. Build field maps from GHL data
-        print("4️⃣  Building field maps...")
-        created_count = 0
-        missing_mappings = []
+        # 3. Build field maps from GHL data
+        print("3️⃣  Building field maps...")
         
+        # Pass 1: split usable fields into mapped and unmapped (one dict lookup each)
+        mapped_fields = []
+        unmapped_fields = []
         for field in custom_fields:
-            field_id = field.get('id')
-            field_key = field.get('fieldKey')
-            name = field.get('name')
-            data_type = field.get('dataType')
-            
-            if not field_id or not field_key:
+            if not field.get('id') or not field.get('fieldKey'):
                 continue
-            
-            # Check if we have a mapping for this field key
-            if field_key in FIELD_KEY_TO_TABLE:
-                table, column, db_data_type = FIELD_KEY_TO_TABLE[field_key]
-                
-                # Create field map entry
-                field_map = FieldMap(
-                    ghl_key=field_id,
-                    field_key=field_key,
-                    table_column=column,
-                    tablename=table,
-                    data_type=db_data_type
-                )
-                
-                try:
-                    db.session.add(field_map)
-                    created_count += 1
-                    print(f"   ✅ {table}.{column} <- {field_key} (ID: {field_id})")
-                except Exception as e:
-                    print(f"   ❌ Error adding {field_key}: {e}")
+            mapping = FIELD_KEY_TO_TABLE.get(field['fieldKey'])
+            if mapping:
+                mapped_fields.append((field, mapping))
             else:
-                missing_mappings.append({
-                    'field_key': field_key,
-                    'name': name,
-                    'id': field_id,
-                    'data_type': data_type
-                })
+                unmapped_fields.append(field)
+        
+        # Pass 2: build the rows for a single bulk upsert, plus the report
+        field_map_rows = [
+            {
+                'ghl_key': field['id'],
+                'field_key': field['fieldKey'],
+                'table_column': column,
+                'tablename': table,
+                'data_type': db_data_type
+            }
+            for field, (table, column, db_data_type) in mapped_fields
+        ]
+        created_lines = [
+            f"   ✅ {row['tablename']}.{row['table_column']} <- {row['field_key']} (ID: {row['ghl_key']})"
+            for row in field_map_rows
+        ]
+        missing_mappings = [
+            {
+                'field_key': field['fieldKey'],
+                'name': field.get('name'),
+                'id': field['id'],
+                'data_type': field.get('dataType')
+            }
+            for field in unmapped_fields
+        ]
         
-        # Commit all changes
+        # 4. Upsert field maps by GHL key and drop mappings GHL no longer has
+        print("4️⃣  Saving field maps...")
         try:
+            if field_map_rows:
+                db.session.execute(field_map_upsert(), field_map_rows)
+            stale = db.session.execute(
+                delete(FieldMap).where(FieldMap.ghl_key.not_in([row['ghl_key'] for row in field_map_rows]))
+            ).rowcount
             db.session.commit()
+            field_map_cached.cache_clear()
+            if created_lines:
+                print("\n".join(created_lines))
             print()
-            print(f"   ✅ Created {created_count} field mappings")
+            print(f"   ✅ Saved {len(field_map_rows)} field mappings")
+            if stale:
+                print(f"   🗑️  Removed {stale} stale mappings")
         except Exception as e:
-            print(f"❌ Error committing field maps: {e}")
+            print(f"❌ Error saving field maps: {e}")
             db.session.rollback()
             sys.exit(1)
         
@@ -1,13 +1,17 @@
 #!/usr/bin/env python3
 """Check what trip-related custom fields exist"""
 
+from sqlalchemy import select
+
 from app import app, db
 from models import CustomField
 
 with app.app_context():
     # Query all custom fields that contain "trip" in the field key
-    trip_fields = CustomField.query.filter(
-        CustomField.field_key.like('%trip%')
+    # (plain column rows; no ORM instances are needed to print them)
+    trip_fields = db.session.execute(
+        select(CustomField.field_key, CustomField.ghl_field_id, CustomField.name, CustomField.model)
+        .where(CustomField.field_key.like('%trip%'))
     ).all()
     
     print("Trip-related custom fields in database:")
@@ -22,6 +26,10 @@ with app.app_context():
     if not trip_fields:
         print("No trip-related fields found!")
         print("\nShowing all opportunity fields instead:")
-        opp_fields = CustomField.query.filter_by(model='opportunity').limit(10).all()
+        opp_fields = db.session.execute(
+            select(CustomField.field_key, CustomField.name)
+            .where(CustomField.model == 'opportunity')
+            .limit(10)
+        ).all()
         for field in opp_fields:
             print(f"  {field.field_key} = {field.name}")
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 """Debug script to see what GHL is actually returning"""
 
+from sqlalchemy import case, func, select
+
 from app import app, ghl_api
 from models import db, CustomField
 
@@ -23,13 +25,19 @@ with app.app_context():
         print(f"Name: {opp.get('name')}")
         print(f"\nCustom Fields ({len(opp.get('customFields', []))}):")
         
-        for field in opp.get('customFields', [])[:10]:  # Show first 10
+        sample = opp.get('customFields', [])[:10]  # Show first 10
+        
+        # Look up all shown fields in our database with one query
+        field_keys_by_id = dict(db.session.execute(
+            select(CustomField.ghl_field_id, CustomField.field_key)
+            .where(CustomField.ghl_field_id.in_([field.get('id') for field in sample]))
+        ).all())
+        
+        for field in sample:
             field_id = field.get('id')
             field_value = field.get('fieldValue')
             
-            # Look up in our database
-            custom_field_def = CustomField.query.filter_by(ghl_field_id=field_id).first()
-            field_key = custom_field_def.field_key if custom_field_def else "NOT FOUND IN DB"
+            field_key = field_keys_by_id.get(field_id, "NOT FOUND IN DB")
             
             print(f"   - ID: {field_id}")
             print(f"     Key: {field_key}")
@@ -38,8 +46,12 @@ with app.app_context():
     
     # Check our custom fields database
     print("\n2️⃣  Checking custom_fields table...")
-    total_fields = CustomField.query.count()
-    opportunity_fields = CustomField.query.filter_by(model='opportunity').count()
+    total_fields, opportunity_fields = db.session.execute(
+        select(
+            func.count(CustomField.id),
+            func.count(case((CustomField.model == 'opportunity', 1)))
+        )
+    ).one()
     
     print(f"   Total custom fields in DB: {total_fields}")
     print(f"   Opportunity fields: {opportunity_fields}")
@@ -11,14 +11,31 @@ Usage:
     python3 export_all_passengers_raw.py
 """
 
-import json
+import math
 import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import orjson
 from dotenv import load_dotenv
 
 load_dotenv()
 
-from ghl_api import GoHighLevelAPI
+from ghl_api import GoHighLevelAPI, GoHighLevelAPIError
+
+# Concurrent page fetches once the total is known
+PAGE_FETCH_WORKERS = 8
+
+# Attempts per page for throttled (429) and 5xx responses. The API session
+# only retries connection errors for the search POST, so status retries
+# happen here, with exponential backoff
+PAGE_RETRIES = 4
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class PageFetchError(Exception):
+    """A page could not be fetched, so the export would be incomplete"""
 
 
 def export_all_passengers():
@@ -54,56 +71,100 @@ def export_all_passengers():
     
     # Fetch all passengers with pagination
     print("📥 Fetching all passenger opportunities...")
-    all_passengers = []
-    page = 1
     limit = 100
-    total_fetched = 0
     
-    while True:
-        print(f"   Page {page}... ", end='', flush=True)
-        
+    def fetch_page(page):
+        """Fetch one page, retrying throttled and 5xx responses with backoff"""
+        for attempt in range(PAGE_RETRIES):
+            try:
+                return api.search_opportunities(
+                    pipeline_id=passenger_pipeline['id'],
+                    limit=limit,
+                    page=page
+                )
+            except GoHighLevelAPIError as e:
+                if e.status_code not in RETRY_STATUSES or attempt == PAGE_RETRIES - 1:
+                    raise
+                delay = 2 ** attempt
+                print(f"\n   ⚠️  Page {page} failed ({e}), retrying in {delay}s...")
+                time.sleep(delay)
+    
+    def iter_pages():
+        """Yield (page, opportunities) in page order; raises PageFetchError
+        if a page still fails after its retries"""
         try:
-            response = api.search_opportunities(
-                pipeline_id=passenger_pipeline['id'],
-                limit=limit,
-                page=page
-            )
-            
-            opportunities = response.get('opportunities', [])
-            count = len(opportunities)
-            
-            if count == 0:
-                print("Done!")
-                break
+            first = fetch_page(1)
+        except Exception as e:
+            raise PageFetchError(f"Error on page 1: {e}") from e
+        opportunities = first.get('opportunities', [])
+        yield 1, opportunities
+        if len(opportunities) < limit:
+            return
+        
+        total = first.get('total') or first.get('meta', {}).get('total')
+        if total:
+            # Total known: fetch the remaining pages concurrently, in page order
+            page_count = math.ceil(total / limit)
+            print(f"   Fetching pages 2-{page_count} concurrently...")
+            with ThreadPoolExecutor(max_workers=PAGE_FETCH_WORKERS) as executor:
+                futures = [executor.submit(fetch_page, page) for page in range(2, page_count + 1)]
+                for page, future in enumerate(futures, start=2):
+                    try:
+                        response = future.result()
+                    except Exception as e:
+                        # The export is incomplete: don't fetch the rest
+                        for pending in futures:
+                            pending.cancel()
+                        raise PageFetchError(f"Error on page {page}: {e}") from e
+                    yield page, response.get('opportunities', [])
+            return
+        
+        # No total reported: walk the pages in order until a short one
+        page = 2
+        while True:
+            try:
+                opportunities = fetch_page(page).get('opportunities', [])
+            except Exception as e:
+                raise PageFetchError(f"Error on page {page}: {e}") from e
             
-            all_passengers.extend(opportunities)
-            total_fetched += count
-            print(f"Got {count} (Total: {total_fetched})")
+            yield page, opportunities
             
             # If we got fewer than limit, we're done
-            if count < limit:
-                break
-            
+            if len(opportunities) < limit:
+                return
             page += 1
-            
-        except Exception as e:
-            print(f"\n❌ Error on page {page}: {e}")
-            break
     
-    print()
-    print(f"✅ Fetched {total_fetched} total passenger opportunities")
-    print()
-    
-    # Save to raw JSON file
+    # Stream each page to a temporary file as it arrives; it replaces the
+    # raw JSON file only once every page has been fetched, so a failed export
+    # never leaves a partial passengers_raw.json behind
     output_path = os.path.expanduser(
         '~/Downloads/claude_code_tripbuilder/tripbuilder/raw_ghl_responses/passengers_raw.json'
     )
+    partial_path = output_path + '.partial'
+    print(f"💾 Streaming to: {output_path}")
     
-    print(f"💾 Saving to: {output_path}")
-    
-    with open(output_path, 'w') as f:
-        json.dump(all_passengers, f, indent=2, default=str)
+    total_fetched = 0
+    try:
+        with open(partial_path, 'wb') as f:
+            f.write(b'[')
+            for page, opportunities in iter_pages():
+                for opp in opportunities:
+                    f.write(b',\n' if total_fetched else b'\n')
+                    f.write(orjson.dumps(opp, default=str))
+                    total_fetched += 1
+                print(f"   Page {page}... Got {len(opportunities)} (Total: {total_fetched})")
+            f.write(b'\n]\n' if total_fetched else b']\n')
+    except BaseException as e:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        if not isinstance(e, PageFetchError):
+            raise
+        print(f"\n❌ {e}")
+        print(f"❌ Export aborted after {total_fetched} records; {output_path} was not written")
+        sys.exit(1)
+    os.replace(partial_path, output_path)
     
+    print()
     print(f"✅ Saved {total_fetched} passenger records")
     print()
     
@@ -7,30 +7,66 @@ for easy debugging and inspection.
 """
 
 import os
-import json
-from datetime import datetime, date
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from operator import attrgetter
+import orjson
 from dotenv import load_dotenv
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 
 # Load environment variables
 load_dotenv()
 
 from app import app
-from models import Trip, Contact, Passenger, Pipeline, PipelineStage
+from models import db, Trip, Contact, Passenger, Pipeline
 
-# JSON encoder for dates
-class DateEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, (datetime, date)):
-            return obj.isoformat()
-        return super().default(obj)
+@lru_cache(maxsize=None)
+def column_getter(model):
+    """Column names of a model and an attrgetter that reads them all at once"""
+    names = tuple(column.name for column in model.__table__.columns)
+    getter = attrgetter(*names)
+    if len(names) == 1:
+        return names, lambda instance: (getter(instance),)
+    return names, getter
 
 def model_to_dict(instance):
     """Convert SQLAlchemy model instance to dictionary"""
-    result = {}
-    for column in instance.__table__.columns:
-        value = getattr(instance, column.name)
-        result[column.name] = value
-    return result
+    names, getter = column_getter(type(instance))
+    return dict(zip(names, getter(instance)))
+
+def write_json_array(path, rows):
+    """Stream dicts to path as a JSON array, one element at a time; returns the count"""
+    count = 0
+    with open(path, 'wb') as f:
+        f.write(b'[')
+        for row in rows:
+            f.write(b',\n' if count else b'\n')
+            # orjson writes dates/datetimes as ISO 8601 itself; str() covers Decimal
+            f.write(orjson.dumps(row, default=str, option=orjson.OPT_INDENT_2))
+            count += 1
+        f.write(b'\n]\n' if count else b']\n')
+    return count
+
+STREAM_BATCH = 1000
+
+def stream(model, *options):
+    """Iterate all rows of a model, fetched from the database in batches.
+    
+    yield_per implies a server-side cursor where the driver supports one, and
+    each batch is detached from the session afterwards so memory stays bounded.
+    """
+    session = db.session
+    rows = session.scalars(select(model).options(*options).execution_options(yield_per=STREAM_BATCH))
+    for count, instance in enumerate(rows, start=1):
+        yield instance
+        if count % STREAM_BATCH == 0:
+            # expunge_all() would swap out the identity map the open result
+            # is still loading into, so detach the instances one by one
+            for loaded in list(session.identity_map.values()):
+                session.expunge(loaded)
+    session.expunge_all()
 
 # Create export directory
 export_dir = 'database_exports'
@@ -43,107 +79,101 @@ print("Database Export to JSON")
 print("=" * 60)
 print(f"\n📁 Exporting to: {export_path}\n")
 
-with app.app_context():
-    # Export Trips
-    print("🗺️  Exporting Trips...")
-    trips = Trip.query.all()
-    trips_data = [model_to_dict(trip) for trip in trips]
-    
-    trips_file = os.path.join(export_path, 'trips.json')
-    with open(trips_file, 'w') as f:
-        json.dump(trips_data, f, indent=2, cls=DateEncoder)
-    print(f"   ✅ Exported {len(trips_data)} trips")
-    
-    # Export Contacts
-    print("\n👥 Exporting Contacts...")
-    contacts = Contact.query.all()
-    contacts_data = [model_to_dict(contact) for contact in contacts]
-    
-    contacts_file = os.path.join(export_path, 'contacts.json')
-    with open(contacts_file, 'w') as f:
-        json.dump(contacts_data, f, indent=2, cls=DateEncoder)
-    print(f"   ✅ Exported {len(contacts_data)} contacts")
-    
-    # Export Passengers
-    print("\n🎫 Exporting Passengers...")
-    passengers = Passenger.query.all()
-    passengers_data = []
-    
-    for passenger in passengers:
+def trip_rows():
+    for trip in stream(Trip):
+        yield model_to_dict(trip)
+
+def contact_rows():
+    for contact in stream(Contact):
+        yield model_to_dict(contact)
+
+passengers_with_trip = 0
+
+def passenger_rows():
+    global passengers_with_trip
+    # Contacts and trips load with one IN query per batch, not per row
+    for passenger in stream(Passenger, selectinload(Passenger.contact), selectinload(Passenger.trip)):
         p_dict = model_to_dict(passenger)
         
         # Add contact info for readability
-        contact = Contact.query.get(passenger.contact_id)
+        contact = passenger.contact
         if contact:
             p_dict['_contact_name'] = f"{contact.firstname} {contact.lastname}"
             p_dict['_contact_email'] = contact.email
         
         # Add trip info for readability
         if passenger.trip_id:
-            trip = Trip.query.get(passenger.trip_id)
+            passengers_with_trip += 1
+            trip = passenger.trip
             if trip:
                 p_dict['_trip_name'] = trip.name
                 p_dict['_trip_destination'] = trip.destination
         
-        passengers_data.append(p_dict)
-    
-    passengers_file = os.path.join(export_path, 'passengers.json')
-    with open(passengers_file, 'w') as f:
-        json.dump(passengers_data, f, indent=2, cls=DateEncoder)
-    print(f"   ✅ Exported {len(passengers_data)} passengers")
-    
-    # Export Pipelines and Stages
-    print("\n📊 Exporting Pipelines...")
-    pipelines = Pipeline.query.all()
-    pipelines_data = []
-    
-    for pipeline in pipelines:
+        yield p_dict
+
+def pipeline_rows():
+    # Stages load with one IN query; the relationship orders them by position
+    for pipeline in stream(Pipeline, selectinload(Pipeline.stages)):
         p_dict = model_to_dict(pipeline)
         
         # Add stages
-        stages = PipelineStage.query.filter_by(pipeline_id=pipeline.id).order_by(PipelineStage.position).all()
-        p_dict['stages'] = [model_to_dict(stage) for stage in stages]
+        p_dict['stages'] = [model_to_dict(stage) for stage in pipeline.stages]
         
-        pipelines_data.append(p_dict)
-    
-    pipelines_file = os.path.join(export_path, 'pipelines.json')
-    with open(pipelines_file, 'w') as f:
-        json.dump(pipelines_data, f, indent=2, cls=DateEncoder)
-    print(f"   ✅ Exported {len(pipelines_data)} pipelines")
-    
-    # Create summary
-    summary = {
-        'export_time': datetime.now().isoformat(),
-        'counts': {
-            'trips': len(trips_data),
-            'contacts': len(contacts_data),
-            'passengers': len(passengers_data),
-            'pipelines': len(pipelines_data)
-        },
-        'trip_passenger_stats': {
-            'passengers_with_trip': len([p for p in passengers if p.trip_id]),
-            'passengers_without_trip': len([p for p in passengers if not p.trip_id])
-        },
-        'files': {
-            'trips': 'trips.json',
-            'contacts': 'contacts.json',
-            'passengers': 'passengers.json',
-            'pipelines': 'pipelines.json'
-        }
+        yield p_dict
+
+def export_table(filename, rows):
+    """Write one export file; runs in its own app context, so with its own session"""
+    with app.app_context():
+        # Read-only export: skip autoflush checks and post-commit expiry
+        session = db.session()
+        session.autoflush = False
+        session.expire_on_commit = False
+        return write_json_array(os.path.join(export_path, filename), rows())
+
+# The tables are independent reads, so export them concurrently
+EXPORTS = [
+    ('🗺️ ', 'trips', 'trips.json', trip_rows),
+    ('👥', 'contacts', 'contacts.json', contact_rows),
+    ('🎫', 'passengers', 'passengers.json', passenger_rows),
+    ('📊', 'pipelines', 'pipelines.json', pipeline_rows),
+]
+
+print("🚀 Exporting Trips, Contacts, Passengers and Pipelines...")
+with ThreadPoolExecutor(max_workers=len(EXPORTS)) as executor:
+    futures = [executor.submit(export_table, filename, rows) for _, _, filename, rows in EXPORTS]
+    counts = {}
+    for (icon, label, _, _), future in zip(EXPORTS, futures):
+        counts[label] = future.result()
+        print(f"   {icon} Exported {counts[label]} {label}")
+
+# Create summary
+summary = {
+    'export_time': datetime.now().isoformat(),
+    'counts': counts,
+    'trip_passenger_stats': {
+        'passengers_with_trip': passengers_with_trip,
+        'passengers_without_trip': counts['passengers'] - passengers_with_trip
+    },
+    'files': {
+        'trips': 'trips.json',
+        'contacts': 'contacts.json',
+        'passengers': 'passengers.json',
+        'pipelines': 'pipelines.json'
     }
-    
-    summary_file = os.path.join(export_path, 'summary.json')
-    with open(summary_file, 'w') as f:
-        json.dump(summary, f, indent=2)
-    
-    print("\n" + "=" * 60)
-    print("✅ Export complete!")
-    print(f"\n📁 Files saved to: {export_path}")
-    print("\nSummary:")
-    print(f"   Trips: {summary['counts']['trips']}")
-    print(f"   Contacts: {summary['counts']['contacts']}")
-    print(f"   Passengers: {summary['counts']['passengers']}")
-    print(f"   Pipelines: {summary['counts']['pipelines']}")
-    print(f"\nPassenger-Trip Links:")
-    print(f"   With trip: {summary['trip_passenger_stats']['passengers_with_trip']}")
-    print(f"   Without trip: {summary['trip_passenger_stats']['passengers_without_trip']}")
+}
+
+summary_file = os.path.join(export_path, 'summary.json')
+with open(summary_file, 'wb') as f:
+    f.write(orjson.dumps(summary, option=orjson.OPT_INDENT_2))
+
+print("\n" + "=" * 60)
+print("✅ Export complete!")
+print(f"\n📁 Files saved to: {export_path}")
+print("\nSummary:")
+print(f"   Trips: {summary['counts']['trips']}")
+print(f"   Contacts: {summary['counts']['contacts']}")
+print(f"   Passengers: {summary['counts']['passengers']}")
+print(f"   Pipelines: {summary['counts']['pipelines']}")
+print(f"\nPassenger-Trip Links:")
+print(f"   With trip: {summary['trip_passenger_stats']['passengers_with_trip']}")
+print(f"   Without trip: {summary['trip_passenger_stats']['passengers_without_trip']}")
@@ -12,16 +12,42 @@ Usage:
     python3 link_passengers_comprehensive.py
 """
 
+import math
 import os
+import sys
+from bisect import bisect_right
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import ahocorasick
 from dotenv import load_dotenv
 from datetime import datetime
+from functools import lru_cache
+from sqlalchemy import func, select, update
 
 load_dotenv()
 
 from app import app
-from models import db, Passenger, Trip, CustomField, FieldMap
+from models import db, Passenger, Trip, CustomField, FieldMap, field_map_cached
 from ghl_api import GoHighLevelAPI
 
+PASSENGER_PIPELINE_ID = "fnsdpRtY9o83Vr4z15bE"
+TRIP_NAME_FIELD_ID = 'tJoung7L6ymp1vHmU2Tq'
+
+# Case-insensitive trip names, lower(trim()), as indexed by
+# ix_trips_name_norm / ix_passengers_trip_name_norm
+TRIP_NAME_NORM = func.lower(func.trim(Trip.name))
+PASSENGER_TRIP_NAME_NORM = func.lower(func.trim(Passenger.trip_name))
+
+# Search page size and concurrent page fetches when re-syncing trip names
+PAGE_SIZE = 100
+FETCH_WORKERS = 8
+
+# Rows per bulk UPDATE batch; each step commits once, after its last batch
+UPDATE_BATCH_SIZE = 1000
+
+# Print a progress line every PROGRESS_EVERY linked passengers
+PROGRESS_EVERY = 1000
+
 
 def ensure_trip_name_field_mapping():
     """
@@ -34,10 +60,7 @@ def ensure_trip_name_field_mapping():
     
     with app.app_context():
         # Check if mapping exists for passengers table
-        mapping = FieldMap.query.filter_by(
-            tablename='passengers',
-            field_key='opportunity.trip_name'
-        ).first()
+        mapping = field_map_cached('passengers', 'opportunity.trip_name')
         
         if mapping:
             print(f"✅ Field mapping already exists:")
@@ -55,10 +78,18 @@ def ensure_trip_name_field_mapping():
             )
             db.session.add(mapping)
             db.session.commit()
+            field_map_cached.cache_clear()
             print(f"✅ Created mapping: opportunity.trip_name -> passengers.trip_name")
         print()
 
 
+@lru_cache(maxsize=4)
+def opportunity_fields_by_id(api):
+    """Opportunity custom field definitions from GHL, keyed by field id (fetched once per api)"""
+    response = api.get_custom_fields(model='opportunity')
+    return {field['id']: field for field in response.get('customFields', []) if field.get('id')}
+
+
 def sync_trip_names_to_ghl_dropdown(api):
     """
     Ensure all trip names exist in the GHL opportunity.trip_name custom field dropdown.
@@ -71,9 +102,10 @@ def sync_trip_names_to_ghl_dropdown(api):
     print()
     
     with app.app_context():
-        # Get all trips
-        trips = Trip.query.all()
-        all_trip_names = sorted(set([trip.name for trip in trips if trip.name]))
+        # Distinct non-empty trip names, straight from the database
+        all_trip_names = set(db.session.scalars(
+            select(Trip.name).where(func.coalesce(Trip.name, '') != '').distinct()
+        ))
         
         print(f"📊 Found {len(all_trip_names)} unique trip names in database")
         print()
@@ -81,15 +113,7 @@ def sync_trip_names_to_ghl_dropdown(api):
         # Get the custom field from GHL
         print("🔍 Fetching custom field definition from GHL...")
         try:
-            response = api.get_custom_fields(model='opportunity')
-            
-            custom_fields = response.get('customFields', [])
-            trip_name_field = None
-            
-            for field in custom_fields:
-                if field.get('id') == 'tJoung7L6ymp1vHmU2Tq':
-                    trip_name_field = field
-                    break
+            trip_name_field = opportunity_fields_by_id(api).get(TRIP_NAME_FIELD_ID)
             
             if not trip_name_field:
                 print("❌ Could not find opportunity.trip_name field in GHL")
@@ -104,9 +128,9 @@ def sync_trip_names_to_ghl_dropdown(api):
             existing_options = trip_name_field.get('options', [])
             print(f"📋 Current dropdown has {len(existing_options)} options")
             
-            # Find missing trip names
+            # Find missing trip names (set difference; no PUT when it is empty)
             existing_option_values = set(existing_options)
-            missing_names = [name for name in all_trip_names if name not in existing_option_values]
+            missing_names = sorted(all_trip_names - existing_option_values)
             
             if not missing_names:
                 print("✅ All trip names already exist in dropdown!")
@@ -121,8 +145,7 @@ def sync_trip_names_to_ghl_dropdown(api):
             print()
             
             # Add missing names to options
-            updated_options = list(existing_option_values) + missing_names
-            updated_options.sort()
+            updated_options = sorted(existing_option_values.union(missing_names))
             
             print(f"🔄 Updating custom field with {len(updated_options)} total options...")
             
@@ -138,6 +161,8 @@ def sync_trip_names_to_ghl_dropdown(api):
                 f"locations/{api.location_id}/customFields/{trip_name_field['id']}",
                 data=update_data
             )
+            # The cached definition no longer has the new options
+            opportunity_fields_by_id.cache_clear()
             
             print(f"✅ Successfully updated GHL dropdown!")
             print(f"   Added {len(missing_names)} new trip names")
@@ -151,6 +176,68 @@ def sync_trip_names_to_ghl_dropdown(api):
             return False
 
 
+def get_trip_name(opportunity):
+    """Return the trip_name custom field value of an opportunity (or None)."""
+    for field in opportunity.get('customFields', []):
+        if field.get('id') == TRIP_NAME_FIELD_ID:
+            # Typed key first (fieldValueString, ...), as the search endpoint returns
+            field_type = field.get('type', '').upper()
+            trip_name = (field.get(f'fieldValue{field_type.capitalize()}') or
+                       field.get('fieldValue') or
+                       field.get('fieldValueString') or
+                       field.get('value'))
+            return str(trip_name) if trip_name else None
+    return None
+
+
+def fetch_passenger_trip_names(api):
+    """
+    Page through the Passenger pipeline and return {opportunity id: trip_name}.
+    
+    Search results embed customFields, so a page of PAGE_SIZE opportunities
+    replaces PAGE_SIZE single-opportunity GETs. Once the first page reports a
+    total, the remaining pages are fetched concurrently.
+    """
+    def fetch_page(page):
+        response = api.search_opportunities(
+            pipeline_id=PASSENGER_PIPELINE_ID,
+            limit=PAGE_SIZE,
+            page=page
+        )
+        return response, response.get('opportunities', [])
+    
+    def collect(opportunities):
+        for opportunity in opportunities:
+            trip_name = get_trip_name(opportunity)
+            if trip_name:
+                trip_names[opportunity['id']] = trip_name
+    
+    trip_names = {}
+    first, opportunities = fetch_page(1)
+    collect(opportunities)
+    if len(opportunities) < PAGE_SIZE:
+        return trip_names
+    
+    total = first.get('total') or first.get('meta', {}).get('total')
+    if total:
+        page_count = math.ceil(total / PAGE_SIZE)
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+            for page, (_, opportunities) in enumerate(executor.map(fetch_page, range(2, page_count + 1)), start=2):
+                collect(opportunities)
+                print(f"   📥 Fetched page {page}/{page_count}")
+        return trip_names
+    
+    # No total reported: walk the pages in order until a short one
+    page = 2
+    while True:
+        _, opportunities = fetch_page(page)
+        collect(opportunities)
+        print(f"   📥 Fetched page {page}")
+        if len(opportunities) < PAGE_SIZE:
+            return trip_names
+        page += 1
+
+
 def resync_passenger_trip_names(api):
     """
     Re-sync passengers from GHL to populate the trip_name field.
@@ -164,7 +251,7 @@ def resync_passenger_trip_names(api):
     with app.app_context():
         # Count passengers without trip_name
         passengers_without_name = Passenger.query.filter(
-            (Passenger.trip_name == None) | (Passenger.trip_name == '')
+            func.coalesce(Passenger.trip_name, '') == ''
         ).count()
         
         if passengers_without_name == 0:
@@ -176,60 +263,126 @@ def resync_passenger_trip_names(api):
         print("🔄 Fetching opportunity data from GHL...")
         print()
         
-        # Get passengers without trip_name
-        passengers = Passenger.query.filter(
-            (Passenger.trip_name == None) | (Passenger.trip_name == '')
+        # Only the ids of passengers without trip_name; no ORM objects are loaded
+        passenger_ids = db.session.scalars(
+            select(Passenger.id).where(func.coalesce(Passenger.trip_name, '') == '')
         ).all()
         
-        updated_count = 0
-        error_count = 0
-        batch_size = 100
-        
-        for i, passenger in enumerate(passengers, 1):
-            try:
-                # Fetch opportunity from GHL
-                response = api._make_request("GET", f"opportunities/{passenger.id}")
-                
-                if 'opportunity' in response:
-                    opportunity = response['opportunity']
-                    custom_fields = opportunity.get('customFields', [])
-                    
-                    # Find trip_name field
-                    for field in custom_fields:
-                        if field.get('id') == 'tJoung7L6ymp1vHmU2Tq':
-                            trip_name = (field.get('fieldValue') or 
-                                       field.get('fieldValueString') or 
-                                       field.get('value'))
-                            
-                            if trip_name:
-                                passenger.trip_name = str(trip_name)
-                                passenger.updated_at = datetime.utcnow()
-                                db.session.add(passenger)
-                                updated_count += 1
-                            break
-                
-                # Commit every batch_size records
-                if i % batch_size == 0:
-                    db.session.commit()
-                    print(f"   💾 Updated {updated_count} passengers (processed {i}/{len(passengers)})")
-                    
-            except Exception as e:
-                error_count += 1
-                if error_count <= 5:  # Only show first 5 errors
-                    print(f"   ⚠️  Error fetching passenger {passenger.id}: {e}")
-                db.session.rollback()
+        # Bulk-fetch the Passenger pipeline, then apply the results in one pass
+        try:
+            trip_names = fetch_passenger_trip_names(api)
+        except Exception as e:
+            print(f"   ❌ Error fetching passenger opportunities: {e}")
+            return False
+        print(f"   ✅ Found trip_name on {len(trip_names)} GHL passenger opportunities")
+        print()
         
-        # Final commit
+        # Primary-key UPDATEs sent as executemany batches of UPDATE_BATCH_SIZE,
+        # all in one transaction with a single COMMIT at the end
+        now = datetime.utcnow()
+        updates = [
+            {'id': passenger_id, 'trip_name': trip_names[passenger_id], 'updated_at': now}
+            for passenger_id in passenger_ids if passenger_id in trip_names
+        ]
+        updated_count = 0
+        for start in range(0, len(updates), UPDATE_BATCH_SIZE):
+            batch = updates[start:start + UPDATE_BATCH_SIZE]
+            db.session.bulk_update_mappings(Passenger, batch)
+            updated_count += len(batch)
+            print(f"   💾 Updated {updated_count}/{len(updates)} passengers")
         db.session.commit()
         
         print()
         print(f"✅ Updated trip_name for {updated_count} passengers")
-        if error_count > 0:
-            print(f"⚠️  {error_count} errors occurred")
         print()
         return True
 
 
+def build_partial_matcher(trip_lower):
+    """
+    Build the partial-match fallback over a {lowercased name: trip id} dict.
+    
+    Returns match(name_lower) giving the first trip id, in dict order, whose
+    lowercased name contains name_lower or is contained in it -- the same trip
+    a scan over trip_lower.items() would pick -- without looping over every
+    trip in Python for each passenger.
+    """
+    keys = list(trip_lower)
+    if not keys:
+        return lambda name_lower: None
+    position = {key: i for i, key in enumerate(keys)}
+    
+    # "name in key": a key containing the name contains each of its trigrams,
+    # so only keys in every posting list of the name's trigrams are checked
+    trigram_index = defaultdict(set)
+    for i, key in enumerate(keys):
+        for start in range(len(key) - 2):
+            trigram_index[key[start:start + 3]].add(i)
+    
+    # Names too short for a trigram: one C-level find() over all keys joined
+    # by a separator no name contains; the first hit lies in the earliest key
+    haystack = '\0'.join(keys)
+    starts = []
+    offset = 0
+    for key in keys:
+        starts.append(offset)
+        offset += len(key) + 1
+    
+    # "key in name": an Aho-Corasick automaton over the keys reports every
+    # key occurring in the name in one pass over it
+    automaton = ahocorasick.Automaton()
+    for key, i in position.items():
+        automaton.add_word(key, i)
+    automaton.make_automaton()
+    
+    def match(name_lower):
+        best = len(keys)
+        if len(name_lower) >= 3:
+            postings = sorted(
+                (trigram_index.get(name_lower[start:start + 3], ()) for start in range(len(name_lower) - 2)),
+                key=len
+            )
+            if postings[0]:
+                for i in set(postings[0]).intersection(*postings[1:]):
+                    if i < best and name_lower in keys[i]:
+                        best = i
+        else:
+            found = haystack.find(name_lower)
+            if found != -1:
+                best = bisect_right(starts, found) - 1
+        
+        for _, i in automaton.iter(name_lower):
+            if i < best:
+                best = i
+        
+        return trip_lower[keys[best]] if best < len(keys) else None
+    
+    return match
+
+
+def link_by_trip_name(trip_key, passenger_key, **values):
+    """
+    Link every unlinked passenger whose passenger_key equals a trip's trip_key
+    with one UPDATE, and return the number of passengers linked. When several
+    trips match, the highest trip id wins.
+    """
+    matched_trip_id = (
+        select(func.max(Trip.id))
+        .where(Trip.name != None, trip_key == passenger_key)
+        .scalar_subquery()
+    )
+    return db.session.execute(
+        update(Passenger)
+        .where(
+            Passenger.trip_id.is_(None),
+            func.coalesce(Passenger.trip_name, '') != '',
+            matched_trip_id != None
+        )
+        .values(trip_id=matched_trip_id, **values)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+
 def link_passengers_to_trips():
     """
     Link passengers to trips by matching trip_name to trip.name.
@@ -242,10 +395,9 @@ def link_passengers_to_trips():
     with app.app_context():
         # Get counts
         total_passengers = Passenger.query.count()
-        passengers_without_trip = Passenger.query.filter_by(trip_id=None).count()
+        passengers_without_trip = Passenger.query.filter(Passenger.trip_id.is_(None)).count()
         passengers_with_trip_name = Passenger.query.filter(
-            Passenger.trip_name != None,
-            Passenger.trip_name != ''
+            func.coalesce(Passenger.trip_name, '') != ''
         ).count()
         total_trips = Trip.query.count()
         
@@ -262,8 +414,11 @@ def link_passengers_to_trips():
         
         # Load all trips into memory for faster matching
         print("📚 Loading all trips into memory...")
-        all_trips = Trip.query.all()
-        trip_lookup = {trip.name.lower(): trip for trip in all_trips if trip.name}
+        # (id, lower(trim(name))) rows only, so the lookup maps normalized
+        # names to trip ids as-is
+        trip_rows = db.session.execute(select(Trip.id, TRIP_NAME_NORM)).all()
+        trip_lookup = {sys.intern(name_norm): trip_id for trip_id, name_norm in trip_rows if name_norm}
+        partial_match = build_partial_matcher(trip_lookup)
         print(f"   Loaded {len(trip_lookup)} trips with names")
         print()
         
@@ -276,50 +431,55 @@ def link_passengers_to_trips():
         no_match_count = 0
         already_linked_count = 0
         
-        # Get passengers without trip_id but with trip_name
-        passengers = Passenger.query.filter(
-            Passenger.trip_id == None,
-            Passenger.trip_name != None,
-            Passenger.trip_name != ''
-        ).all()
+        # Case-insensitive exact matches as one set-based UPDATE in the
+        # database; only the remaining passengers are matched in Python below
+        linked_count += link_by_trip_name(
+            TRIP_NAME_NORM,
+            PASSENGER_TRIP_NAME_NORM,
+            updated_at=datetime.utcnow()
+        )
+        print(f"   ✅ Linked {linked_count} passengers by exact trip name")
+        
+        # Stream (id, trip_name) rows of the passengers still without a trip;
+        # no Passenger objects are loaded, matches are collected as mappings
+        remaining = select(Passenger.id, Passenger.trip_name, PASSENGER_TRIP_NAME_NORM).where(
+            Passenger.trip_id.is_(None),
+            func.coalesce(Passenger.trip_name, '') != ''
+        ).execution_options(yield_per=UPDATE_BATCH_SIZE)
         
         unmatched_names = set()
+        updates = []
+        now = datetime.utcnow()
         
-        for i, passenger in enumerate(passengers, 1):
-            try:
-                trip_name = passenger.trip_name.strip()
-                
-                # Try exact match (case-insensitive)
-                matching_trip = trip_lookup.get(trip_name.lower())
-                
-                # Try partial match if exact fails
-                if not matching_trip:
-                    for trip_key, trip in trip_lookup.items():
-                        if trip_name.lower() in trip_key or trip_key in trip_name.lower():
-                            matching_trip = trip
-                            break
-                
-                if matching_trip:
-                    passenger.trip_id = matching_trip.id
-                    passenger.updated_at = datetime.utcnow()
-                    db.session.add(passenger)
-                    linked_count += 1
-                    
-                    if linked_count % 50 == 0:
-                        print(f"   ✅ Linked {linked_count} passengers...")
-                else:
-                    no_match_count += 1
-                    unmatched_names.add(trip_name)
+        for passenger_id, trip_name, name_norm in db.session.execute(remaining):
+            # Try exact match (case-insensitive)
+            matching_trip_id = trip_lookup.get(name_norm)
+            
+            # Try partial match if exact fails
+            if matching_trip_id is None:
+                matching_trip_id = partial_match(name_norm)
+            
+            if matching_trip_id is not None:
+                updates.append({'id': passenger_id, 'trip_id': matching_trip_id, 'updated_at': now})
+                linked_count += 1
                 
-                # Commit every 100 records
-                if i % 100 == 0:
-                    db.session.commit()
-                    
-            except Exception as e:
-                print(f"   ❌ Error processing passenger {passenger.id}: {e}")
-                db.session.rollback()
+                if linked_count % PROGRESS_EVERY == 0:
+                    print(f"   ✅ Linked {linked_count} passengers...")
+            else:
+                no_match_count += 1
+                unmatched_names.add(trip_name.strip())
         
-        # Final commit
+        # Primary-key UPDATEs sent as executemany batches of UPDATE_BATCH_SIZE.
+        # The whole step is one transaction (one COMMIT); each batch runs in a
+        # SAVEPOINT so a failing batch is rolled back without losing the rest
+        for start in range(0, len(updates), UPDATE_BATCH_SIZE):
+            batch = updates[start:start + UPDATE_BATCH_SIZE]
+            try:
+                with db.session.begin_nested():
+                    db.session.bulk_update_mappings(Passenger, batch)
+            except Exception as e:
+                print(f"   ❌ Error saving passengers {batch[0]['id']}-{batch[-1]['id']}: {e}")
+                linked_count -= len(batch)
         db.session.commit()
         
         print()
@@ -336,7 +496,7 @@ def link_passengers_to_trips():
                 print(f"   - {name}")
         
         # Verify final state
-        remaining = Passenger.query.filter_by(trip_id=None).count()
+        remaining = Passenger.query.filter(Passenger.trip_id.is_(None)).count()
         print()
         print(f"📊 Final Status:")
         print(f"   Passengers with trip_id: {total_passengers - remaining}")
@@ -13,17 +13,44 @@ Usage:
     python3 link_passengers_from_raw_json.py
 """
 
-import json
+import math
 import os
+import sys
+from bisect import bisect_right
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+import ahocorasick
+import ijson
 from dotenv import load_dotenv
+from sqlalchemy import func, select, update
 
 load_dotenv()
 
 from app import app
-from models import db, Passenger, Trip, CustomField, FieldMap
+from models import db, Passenger, Trip, CustomField, FieldMap, field_map_cached
 from ghl_api import GoHighLevelAPI
 
+TRIP_NAME_FIELD_ID = 'tJoung7L6ymp1vHmU2Tq'
+
+# Case-insensitive trip names, lower(trim()), as indexed by
+# ix_trips_name_norm / ix_passengers_trip_name_norm
+TRIP_NAME_NORM = func.lower(func.trim(Trip.name))
+PASSENGER_TRIP_NAME_NORM = func.lower(func.trim(Passenger.trip_name))
+
+# Passenger ids per lookup SELECT / bulk UPDATE
+BATCH_SIZE = 500
+
+# Concurrent trip_name writers, each on its own session and connection
+# (keep <= pool_size + max_overflow, 5 + 10 by default)
+UPDATE_WORKERS = 8
+
+# Print a progress line every PROGRESS_EVERY linked passengers
+PROGRESS_EVERY = 1000
+
 
 def get_field_value_by_type(field_data):
     """
@@ -59,57 +86,99 @@ def extract_trip_names_from_raw_json():
     print("=" * 70)
     print()
     
-    json_path = os.path.expanduser(
+    json_path = Path(
         '~/Downloads/claude_code_tripbuilder/tripbuilder/raw_ghl_responses/passengers_raw.json'
-    )
+    ).expanduser()
     
-    if not os.path.exists(json_path):
+    if not json_path.is_file():
         print(f"❌ File not found: {json_path}")
         return {}
     
     print(f"📂 Reading file: {json_path}")
     
-    with open(json_path, 'r') as f:
-        passengers_data = json.load(f)
-    
-    print(f"   Loaded {len(passengers_data)} passenger records")
-    print()
-    
     # Extract trip names
-    trip_name_field_id = 'tJoung7L6ymp1vHmU2Tq'
+    trip_name_field_id = TRIP_NAME_FIELD_ID
     passenger_trip_names = {}
     passengers_with_trip_name = 0
+    passenger_count = 0
     
-    for passenger in passengers_data:
-        passenger_id = passenger.get('id')
-        if not passenger_id:
-            continue
-        
-        custom_fields = passenger.get('customFields', [])
-        
-        for field in custom_fields:
-            if field.get('id') == trip_name_field_id:
-                trip_name = get_field_value_by_type(field)
-                
-                if trip_name:
-                    passenger_trip_names[passenger_id] = str(trip_name)
-                    passengers_with_trip_name += 1
-                break
+    # Stream the array one record at a time instead of loading the whole file
+    with json_path.open('rb') as f:
+        for passenger in ijson.items(f, 'item', use_float=True):
+            passenger_count += 1
+            passenger_id = passenger.get('id')
+            if not passenger_id:
+                continue
+            
+            custom_fields = passenger.get('customFields', [])
+            
+            for field in custom_fields:
+                if field.get('id') == trip_name_field_id:
+                    trip_name = get_field_value_by_type(field)
+                    
+                    if trip_name:
+                        passenger_trip_names[passenger_id] = str(trip_name)
+                        passengers_with_trip_name += 1
+                    break
+    
+    print(f"   Loaded {passenger_count} passenger records")
+    print()
     
     print(f"✅ Extracted trip names:")
     print(f"   Passengers with trip_name: {passengers_with_trip_name}")
-    print(f"   Passengers without trip_name: {len(passengers_data) - passengers_with_trip_name}")
+    print(f"   Passengers without trip_name: {passenger_count - passengers_with_trip_name}")
     print()
     
     # Show sample
     if passenger_trip_names:
-        sample_id = list(passenger_trip_names.keys())[0]
+        sample_id = next(iter(passenger_trip_names))
         print(f"   Sample: {sample_id[:20]}... -> {passenger_trip_names[sample_id]}")
         print()
     
     return passenger_trip_names
 
 
+def apply_trip_names(passenger_trip_names, ids, now):
+    """
+    Write trip_name for one chunk of passenger ids that are still missing it.
+    
+    Runs in its own app context, so with its own session and connection, and
+    commits once. Returns (updated, already_set, not_found) counts.
+    """
+    updated_count = 0
+    not_found_count = 0
+    already_set_count = 0
+    
+    with app.app_context():
+        # One SELECT per batch of ids instead of one per passenger, and one
+        # bulk UPDATE (executemany) per batch for the rows still missing a name
+        ids = iter(ids)
+        while batch := list(islice(ids, BATCH_SIZE)):
+            existing = dict(db.session.execute(
+                select(Passenger.id, Passenger.trip_name).where(Passenger.id.in_(batch))
+            ).all())
+            
+            updates = []
+            for passenger_id in batch:
+                if passenger_id not in existing:
+                    not_found_count += 1
+                    continue
+                
+                current = existing[passenger_id]
+                if current and current.strip():
+                    already_set_count += 1
+                    continue
+                
+                updates.append({'id': passenger_id, 'trip_name': passenger_trip_names[passenger_id], 'updated_at': now})
+            
+            if updates:
+                db.session.bulk_update_mappings(Passenger, updates)
+                updated_count += len(updates)
+        db.session.commit()
+    
+    return updated_count, already_set_count, not_found_count
+
+
 def update_passenger_trip_names(passenger_trip_names):
     """
     Update passenger records in database with trip_name values.
@@ -119,40 +188,31 @@ def update_passenger_trip_names(passenger_trip_names):
     print("=" * 70)
     print()
     
-    with app.app_context():
-        updated_count = 0
-        not_found_count = 0
-        already_set_count = 0
-        
-        for passenger_id, trip_name in passenger_trip_names.items():
-            passenger = Passenger.query.get(passenger_id)
-            
-            if not passenger:
-                not_found_count += 1
-                continue
-            
-            if passenger.trip_name and passenger.trip_name.strip():
-                already_set_count += 1
-                continue
-            
-            passenger.trip_name = trip_name
-            passenger.updated_at = datetime.utcnow()
-            db.session.add(passenger)
-            updated_count += 1
-            
-            if updated_count % 100 == 0:
-                db.session.commit()
-                print(f"   💾 Updated {updated_count} passengers...")
-        
-        # Final commit
-        db.session.commit()
-        
-        print()
-        print(f"✅ Results:")
-        print(f"   Updated: {updated_count} passengers")
-        print(f"   Already had trip_name: {already_set_count} passengers")
-        print(f"   Not found in DB: {not_found_count} passengers")
-        print()
+    updated_count = 0
+    not_found_count = 0
+    already_set_count = 0
+    now = datetime.utcnow()
+    
+    # Disjoint chunks of ids, applied concurrently; each worker commits its
+    # own chunk, so the commit round trips overlap instead of queueing
+    ids = list(passenger_trip_names)
+    chunk_size = max(BATCH_SIZE, math.ceil(len(ids) / UPDATE_WORKERS))
+    chunks = [ids[start:start + chunk_size] for start in range(0, len(ids), chunk_size)]
+    with ThreadPoolExecutor(max_workers=UPDATE_WORKERS) as executor:
+        futures = [executor.submit(apply_trip_names, passenger_trip_names, chunk, now) for chunk in chunks]
+        for future in as_completed(futures):
+            updated, already_set, not_found = future.result()
+            updated_count += updated
+            already_set_count += already_set
+            not_found_count += not_found
+            print(f"   💾 Updated {updated_count} passengers...")
+    
+    print()
+    print(f"✅ Results:")
+    print(f"   Updated: {updated_count} passengers")
+    print(f"   Already had trip_name: {already_set_count} passengers")
+    print(f"   Not found in DB: {not_found_count} passengers")
+    print()
 
 
 def ensure_field_mapping():
@@ -163,10 +223,7 @@ def ensure_field_mapping():
     print()
     
     with app.app_context():
-        mapping = FieldMap.query.filter_by(
-            tablename='passengers',
-            field_key='opportunity.trip_name'
-        ).first()
+        mapping = field_map_cached('passengers', 'opportunity.trip_name')
         
         if mapping:
             print(f"✅ Field mapping exists: {mapping.field_key} -> passengers.{mapping.table_column}")
@@ -181,10 +238,18 @@ def ensure_field_mapping():
             )
             db.session.add(mapping)
             db.session.commit()
+            field_map_cached.cache_clear()
             print("✅ Created field mapping")
         print()
 
 
+@lru_cache(maxsize=4)
+def opportunity_fields_by_id(api):
+    """Opportunity custom field definitions from GHL, keyed by field id (fetched once per api)"""
+    response = api.get_custom_fields(model='opportunity')
+    return {field['id']: field for field in response.get('customFields', []) if field.get('id')}
+
+
 def sync_trip_names_to_ghl_dropdown(api):
     """
     Ensure all trip names exist in GHL opportunity.trip_name dropdown.
@@ -195,9 +260,10 @@ def sync_trip_names_to_ghl_dropdown(api):
     print()
     
     with app.app_context():
-        # Get all unique trip names from database
-        trips = Trip.query.all()
-        all_trip_names = sorted(set([trip.name for trip in trips if trip.name]))
+        # Distinct non-empty trip names, straight from the database
+        all_trip_names = set(db.session.scalars(
+            select(Trip.name).where(func.coalesce(Trip.name, '') != '').distinct()
+        ))
         
         print(f"📊 Found {len(all_trip_names)} unique trip names in database")
         print()
@@ -205,14 +271,7 @@ def sync_trip_names_to_ghl_dropdown(api):
         # Get the custom field from GHL
         print("🔍 Fetching custom field definition from GHL...")
         try:
-            response = api.get_custom_fields(model='opportunity')
-            custom_fields = response.get('customFields', [])
-            
-            trip_name_field = None
-            for field in custom_fields:
-                if field.get('id') == 'tJoung7L6ymp1vHmU2Tq':
-                    trip_name_field = field
-                    break
+            trip_name_field = opportunity_fields_by_id(api).get(TRIP_NAME_FIELD_ID)
             
             if not trip_name_field:
                 print("❌ Could not find opportunity.trip_name field in GHL")
@@ -226,9 +285,9 @@ def sync_trip_names_to_ghl_dropdown(api):
             existing_options = trip_name_field.get('options', [])
             print(f"📋 Current dropdown has {len(existing_options)} options")
             
-            # Find missing trip names
+            # Find missing trip names (set difference; no PUT when it is empty)
             existing_set = set(existing_options)
-            missing_names = [name for name in all_trip_names if name not in existing_set]
+            missing_names = sorted(all_trip_names - existing_set)
             
             if not missing_names:
                 print("✅ All trip names already in dropdown!")
@@ -246,8 +305,7 @@ def sync_trip_names_to_ghl_dropdown(api):
             print()
             
             # Update the dropdown
-            updated_options = list(existing_set) + missing_names
-            updated_options.sort()
+            updated_options = sorted(existing_set.union(missing_names))
             
             print(f"🔄 Updating GHL dropdown with {len(updated_options)} total options...")
             
@@ -262,6 +320,8 @@ def sync_trip_names_to_ghl_dropdown(api):
                 f"locations/{api.location_id}/customFields/{trip_name_field['id']}",
                 data=update_data
             )
+            # The cached definition no longer has the new options
+            opportunity_fields_by_id.cache_clear()
             
             print(f"✅ Successfully updated GHL dropdown!")
             print(f"   Added {len(missing_names)} new options")
@@ -275,6 +335,91 @@ def sync_trip_names_to_ghl_dropdown(api):
             return False
 
 
+def build_partial_matcher(trip_lower):
+    """
+    Build the partial-match fallback over a {lowercased name: trip id} dict.
+    
+    Returns match(name_lower) giving the first trip id, in dict order, whose
+    lowercased name contains name_lower or is contained in it -- the same trip
+    a scan over trip_lower.items() would pick -- without looping over every
+    trip in Python for each passenger.
+    """
+    keys = list(trip_lower)
+    if not keys:
+        return lambda name_lower: None
+    position = {key: i for i, key in enumerate(keys)}
+    
+    # "name in key": a key containing the name contains each of its trigrams,
+    # so only keys in every posting list of the name's trigrams are checked
+    trigram_index = defaultdict(set)
+    for i, key in enumerate(keys):
+        for start in range(len(key) - 2):
+            trigram_index[key[start:start + 3]].add(i)
+    
+    # Names too short for a trigram: one C-level find() over all keys joined
+    # by a separator no name contains; the first hit lies in the earliest key
+    haystack = '\0'.join(keys)
+    starts = []
+    offset = 0
+    for key in keys:
+        starts.append(offset)
+        offset += len(key) + 1
+    
+    # "key in name": an Aho-Corasick automaton over the keys reports every
+    # key occurring in the name in one pass over it
+    automaton = ahocorasick.Automaton()
+    for key, i in position.items():
+        automaton.add_word(key, i)
+    automaton.make_automaton()
+    
+    def match(name_lower):
+        best = len(keys)
+        if len(name_lower) >= 3:
+            postings = sorted(
+                (trigram_index.get(name_lower[start:start + 3], ()) for start in range(len(name_lower) - 2)),
+                key=len
+            )
+            if postings[0]:
+                for i in set(postings[0]).intersection(*postings[1:]):
+                    if i < best and name_lower in keys[i]:
+                        best = i
+        else:
+            found = haystack.find(name_lower)
+            if found != -1:
+                best = bisect_right(starts, found) - 1
+        
+        for _, i in automaton.iter(name_lower):
+            if i < best:
+                best = i
+        
+        return trip_lower[keys[best]] if best < len(keys) else None
+    
+    return match
+
+
+def link_by_trip_name(trip_key, passenger_key, **values):
+    """
+    Link every unlinked passenger whose passenger_key equals a trip's trip_key
+    with one UPDATE, and return the number of passengers linked. When several
+    trips match, the highest trip id wins.
+    """
+    matched_trip_id = (
+        select(func.max(Trip.id))
+        .where(Trip.name != None, trip_key == passenger_key)
+        .scalar_subquery()
+    )
+    return db.session.execute(
+        update(Passenger)
+        .where(
+            Passenger.trip_id.is_(None),
+            func.coalesce(Passenger.trip_name, '') != '',
+            matched_trip_id != None
+        )
+        .values(trip_id=matched_trip_id, **values)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+
 def link_passengers_to_trips():
     """
     Link passengers to trips by matching trip_name.
@@ -287,10 +432,9 @@ def link_passengers_to_trips():
     with app.app_context():
         # Get stats
         total_passengers = Passenger.query.count()
-        passengers_without_trip = Passenger.query.filter_by(trip_id=None).count()
+        passengers_without_trip = Passenger.query.filter(Passenger.trip_id.is_(None)).count()
         passengers_with_trip_name = Passenger.query.filter(
-            Passenger.trip_name != None,
-            Passenger.trip_name != ''
+            func.coalesce(Passenger.trip_name, '') != ''
         ).count()
         
         print(f"📊 Database Status:")
@@ -305,18 +449,21 @@ def link_passengers_to_trips():
         
         # Build trip lookup tables
         print("📚 Building trip lookup tables...")
-        all_trips = Trip.query.all()
+        # (id, name, lower(trim(name))) rows only; the lookups map names to trip ids
+        trip_rows = db.session.execute(select(Trip.id, Trip.name, TRIP_NAME_NORM)).all()
         
         # Exact match lookup
         trip_exact = {}
         # Case-insensitive lookup
         trip_lower = {}
         
-        for trip in all_trips:
-            if trip.name:
-                trip_exact[trip.name] = trip
-                trip_lower[trip.name.lower()] = trip
+        for trip_id, name, name_norm in trip_rows:
+            if name:
+                trip_exact[name] = trip_id
+            if name_norm:
+                trip_lower[sys.intern(name_norm)] = trip_id
         
+        partial_match = build_partial_matcher(trip_lower)
         print(f"   Loaded {len(trip_exact)} trips")
         print()
         
@@ -326,48 +473,51 @@ def link_passengers_to_trips():
         no_trip_name = 0
         no_match = 0
         
-        passengers = Passenger.query.filter(
-            Passenger.trip_id == None,
-            Passenger.trip_name != None,
-            Passenger.trip_name != ''
-        ).all()
+        # Exact, then case-insensitive, matches as set-based UPDATEs in the
+        # database; only the remaining passengers are matched in Python below
+        linked_count += link_by_trip_name(Trip.name, func.trim(Passenger.trip_name))
+        linked_count += link_by_trip_name(TRIP_NAME_NORM, PASSENGER_TRIP_NAME_NORM)
+        print(f"   ✅ Linked {linked_count} passengers by exact trip name")
+        
+        # Stream (id, trip_name) rows of the passengers still without a trip;
+        # no Passenger objects are loaded, matches are collected as mappings
+        remaining = select(Passenger.id, Passenger.trip_name, PASSENGER_TRIP_NAME_NORM).where(
+            Passenger.trip_id.is_(None),
+            func.coalesce(Passenger.trip_name, '') != ''
+        ).execution_options(yield_per=BATCH_SIZE)
         
         unmatched_samples = []
+        updates = []
         
-        for i, passenger in enumerate(passengers, 1):
-            trip_name = passenger.trip_name.strip()
+        for passenger_id, trip_name, name_norm in db.session.execute(remaining):
+            trip_name = trip_name.strip()
             
             # Try exact match
-            trip = trip_exact.get(trip_name)
+            trip_id = trip_exact.get(trip_name)
             
             # Try case-insensitive
-            if not trip:
-                trip = trip_lower.get(trip_name.lower())
+            if trip_id is None:
+                trip_id = trip_lower.get(name_norm)
             
             # Try partial match
-            if not trip:
-                name_lower = trip_name.lower()
-                for stored_lower, stored_trip in trip_lower.items():
-                    if name_lower in stored_lower or stored_lower in name_lower:
-                        trip = stored_trip
-                        break
+            if trip_id is None:
+                trip_id = partial_match(name_norm)
             
-            if trip:
-                passenger.trip_id = trip.id
-                db.session.add(passenger)
+            if trip_id is not None:
+                updates.append({'id': passenger_id, 'trip_id': trip_id})
                 linked_count += 1
                 
-                if linked_count % 100 == 0:
+                if linked_count % PROGRESS_EVERY == 0:
                     print(f"   ✅ Linked {linked_count}...")
-                    db.session.commit()
             else:
                 no_match += 1
                 if len(unmatched_samples) < 10:
                     unmatched_samples.append(trip_name)
-            
-            if i % 500 == 0:
-                db.session.commit()
         
+        # One bulk UPDATE per BATCH_SIZE matches, and a single COMMIT for the
+        # set-based passes and these together
+        for start in range(0, len(updates), BATCH_SIZE):
+            db.session.bulk_update_mappings(Passenger, updates[start:start + BATCH_SIZE])
         db.session.commit()
         
         print()
@@ -384,7 +534,7 @@ def link_passengers_to_trips():
                 print(f"   - {name}")
             print()
         
-        remaining = Passenger.query.filter_by(trip_id=None).count()
+        remaining = Passenger.query.filter(Passenger.trip_id.is_(None)).count()
         success_rate = ((total_passengers - remaining) / total_passengers) * 100
         
         print(f"📊 Final Status:")
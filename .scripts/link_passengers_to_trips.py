@@ -7,11 +7,27 @@ This script:
 2. Fetches their opportunity data from GHL to get trip_name
 3. Matches trip_name against trips.name
 4. Updates passenger records with matching trip_id
+
+Opportunity customFields are cached in .cache/ so re-runs skip refetching.
+
+Usage:
+    python3 link_passengers_to_trips.py [--no-cache]
 """
 
+import json
+import math
 import os
+import re
+import sys
+import time
+from array import array
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+import ahocorasick
 from dotenv import load_dotenv
-from sqlalchemy import func
+from sqlalchemy import bindparam, func, select, update
 
 load_dotenv()
 
@@ -20,50 +36,265 @@ from models import db, Passenger, Trip
 from ghl_api import GoHighLevelAPI
 
 
-def get_trip_name_from_opportunity(api, opportunity_id):
+# GHL custom field ID of the passenger opportunity's trip_name
+TRIP_NAME_FIELD_ID = 'tJoung7L6ymp1vHmU2Tq'
+
+# Print a progress line every PROGRESS_EVERY linked passengers
+PROGRESS_EVERY = 1000
+
+# Passenger opportunities are paged through in searches of PAGE_SIZE;
+# whatever the search misses falls back to concurrent single-opportunity GETs
+# (the client's rate limiter and retries are thread-safe)
+PASSENGER_PIPELINE_ID = "fnsdpRtY9o83Vr4z15bE"
+PAGE_SIZE = 100
+FETCH_WORKERS = 16
+
+# Unlinked passenger ids are streamed from the database, then fetched, matched
+# and written, this many at a time
+STREAM_BATCH = 500
+
+# Opportunity customFields cached between runs (skip with --no-cache).
+# Opportunities without a trip_name are refetched sooner, in case it is set in GHL
+OPPORTUNITY_CACHE = Path('.cache') / 'opportunity_custom_fields.json'
+CACHE_MAX_AGE = 24 * 3600
+MISSING_MAX_AGE = 3600
+
+# Trips preprocessed for find_matching_trip(): (lowercased name, Trip) pairs in
+# trip order, {lowercased name: first trip}, {trigram: positions in named},
+# and an automaton over the lowercased names whose values are those positions
+TripIndex = namedtuple('TripIndex', 'named exact trigrams automaton')
+
+# Two DP rows reused by bounded_levenshtein() (matching runs on the main thread)
+_buf = [array('i'), array('i')]
+
+
+def load_opportunity_cache():
+    """
+    Load cached opportunity customFields from disk.
+    
+    Returns:
+        dict: {opportunity id: {'fetched_at': timestamp, 'customFields': [...] or None}}
+    """
+    try:
+        return json.loads(OPPORTUNITY_CACHE.read_bytes())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_opportunity_cache(cache):
+    """Write the opportunity cache back to disk."""
+    OPPORTUNITY_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    OPPORTUNITY_CACHE.write_text(json.dumps(cache))
+
+
+def trip_name_from_custom_fields(custom_fields):
+    """
+    Extract the trip_name custom field value from an opportunity's customFields.
+    
+    Args:
+        custom_fields: List of customFields from a GHL opportunity (or None)
+    
+    Returns:
+        str: Trip name or None
+    """
+    # Look for trip_name field by ID
+    fields_by_id = {field.get('id'): field for field in custom_fields or ()}
+    field = fields_by_id.get(TRIP_NAME_FIELD_ID)
+    if field is None:
+        return None
+    
+    # Get the value
+    return (field.get('fieldValue') or 
+            field.get('fieldValueString') or 
+            field.get('value'))
+
+
+def is_fresh(entry):
+    """Whether a cache entry is recent enough to use instead of the API."""
+    max_age = CACHE_MAX_AGE if trip_name_from_custom_fields(entry['customFields']) else MISSING_MAX_AGE
+    return time.time() - entry['fetched_at'] < max_age
+
+
+def prefetch_passenger_opportunities(api, cache):
+    """
+    Page through the Passenger pipeline and store every opportunity's
+    customFields in the cache.
+    
+    A page of PAGE_SIZE search results replaces PAGE_SIZE single-opportunity
+    GETs. Once the first page reports a total, the remaining pages are
+    fetched concurrently.
+    
+    Args:
+        api: GoHighLevelAPI instance
+        cache: Opportunity cache dict, updated in place
+    """
+    def fetch_page(page):
+        response = api.search_opportunities(
+            pipeline_id=PASSENGER_PIPELINE_ID,
+            limit=PAGE_SIZE,
+            page=page
+        )
+        return response, response.get('opportunities', [])
+    
+    def collect(opportunities):
+        fetched_at = time.time()
+        for opportunity in opportunities:
+            cache[opportunity['id']] = {
+                'fetched_at': fetched_at,
+                'customFields': opportunity.get('customFields', [])
+            }
+    
+    first, opportunities = fetch_page(1)
+    collect(opportunities)
+    if len(opportunities) < PAGE_SIZE:
+        return
+    
+    total = first.get('total') or first.get('meta', {}).get('total')
+    if total:
+        page_count = math.ceil(total / PAGE_SIZE)
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+            for page, (_, opportunities) in enumerate(executor.map(fetch_page, range(2, page_count + 1)), start=2):
+                collect(opportunities)
+                print(f"   📥 Fetched page {page}/{page_count}")
+        return
+    
+    # No total reported: walk the pages in order until a short one
+    page = 2
+    while True:
+        _, opportunities = fetch_page(page)
+        collect(opportunities)
+        print(f"   📥 Fetched page {page}")
+        if len(opportunities) < PAGE_SIZE:
+            return
+        page += 1
+
+
+def get_trip_name_from_opportunity(api, opportunity_id, cache=None):
     """
     Fetch opportunity from GHL and extract trip_name custom field.
     
+    With a cache (see load_opportunity_cache), a fresh cached entry is used
+    instead of the API. The raw customFields are cached, so a change to the
+    extraction does not require refetching. Failed requests are not cached.
+    
     Args:
         api: GoHighLevelAPI instance
         opportunity_id: GHL opportunity ID
+        cache: Optional opportunity cache dict, updated in place
     
     Returns:
         str: Trip name or None
     """
+    entry = cache.get(opportunity_id) if cache is not None else None
+    if entry is not None and is_fresh(entry):
+        return trip_name_from_custom_fields(entry['customFields'])
+    
     try:
         # Fetch the opportunity
         response = api._make_request("GET", f"opportunities/{opportunity_id}")
-        
-        if 'opportunity' in response:
-            opportunity = response['opportunity']
-            custom_fields = opportunity.get('customFields', [])
-            
-            # Look for trip_name field (GHL field ID: tJoung7L6ymp1vHmU2Tq)
-            for field in custom_fields:
-                if field.get('id') == 'tJoung7L6ymp1vHmU2Tq':
-                    # Get the value
-                    trip_name = (field.get('fieldValue') or 
-                               field.get('fieldValueString') or 
-                               field.get('value'))
-                    return trip_name
-        
-        return None
-        
     except Exception as e:
         print(f"  ⚠️  Error fetching opportunity {opportunity_id}: {e}")
         return None
+    
+    custom_fields = None
+    if 'opportunity' in response:
+        custom_fields = response['opportunity'].get('customFields', [])
+    
+    if cache is not None:
+        cache[opportunity_id] = {'fetched_at': time.time(), 'customFields': custom_fields}
+    
+    return trip_name_from_custom_fields(custom_fields)
+
+
+def bounded_levenshtein(a, b, max_dist=2):
+    """
+    Levenshtein distance between a and b, or None if it exceeds max_dist.
+    
+    Two-row DP over the shorter string; stops as soon as every entry in a
+    row is above max_dist, since the distance can only grow from there.
+    
+    Args:
+        a: First string
+        b: Second string
+        max_dist: Largest distance worth reporting
+    
+    Returns:
+        int: Edit distance, or None if greater than max_dist
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if len(a) - len(b) > max_dist:
+        return None
+    
+    width = len(b) + 1
+    previous, current = _buf
+    if len(previous) < width:
+        previous.extend(range(len(previous), width))
+        current.extend([0] * (width - len(current)))
+    for j in range(width):
+        previous[j] = j
+    
+    for i, char_a in enumerate(a, 1):
+        current[0] = i
+        row_min = i
+        for j, char_b in enumerate(b, 1):
+            cost = previous[j - 1] + (char_a != char_b)
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            current[j] = cost
+            if cost < row_min:
+                row_min = cost
+        if row_min > max_dist:
+            return None
+        previous, current = current, previous
+    
+    distance = previous[width - 1]
+    return distance if distance <= max_dist else None
 
 
-def find_matching_trip(trip_name, all_trips):
+def build_trip_index(all_trips):
+    """
+    Preprocess the trips once, ahead of the passenger loop.
+    
+    Each trip name is lowercased (and interned) once. The index holds an
+    exact-match dict, a trigram index over the names for "name in trip
+    name" candidates, and an Aho-Corasick automaton that finds every trip
+    name inside a passenger's name in one pass.
+    
+    Args:
+        all_trips: List of all Trip objects
+    
+    Returns:
+        TripIndex: Index for find_matching_trip()
+    """
+    named = [(sys.intern(trip.name.lower()), trip) for trip in all_trips if trip.name]
+    exact = {}
+    trigrams = defaultdict(set)
+    automaton = ahocorasick.Automaton()
+    for position, (trip_lower, trip) in enumerate(named):
+        exact.setdefault(trip_lower, trip)
+        for start in range(len(trip_lower) - 2):
+            trigrams[trip_lower[start:start + 3]].add(position)
+        if trip_lower not in automaton:
+            automaton.add_word(trip_lower, position)
+    if named:
+        automaton.make_automaton()
+    return TripIndex(named, exact, trigrams, automaton)
+
+
+def find_matching_trip(trip_name, trip_index):
     """
     Find a trip that matches the given trip name.
     
     Uses fuzzy matching with ILIKE for case-insensitive partial matches.
+    Each step returns the first trip, in trip order, that a scan over all
+    trips would return. Typos are left to find_typo_trip().
     
     Args:
         trip_name: Trip name to search for
-        all_trips: List of all Trip objects
+        trip_index: TripIndex from build_trip_index()
     
     Returns:
         Trip: Matching trip or None
@@ -74,27 +305,92 @@ def find_matching_trip(trip_name, all_trips):
     trip_name = str(trip_name).strip()
     if len(trip_name) < 3:  # Skip very short names
         return None
+    name_lower = trip_name.lower()
+    
+    named = trip_index.named
+    if not named:
+        return None
     
     # First try exact match (case-insensitive)
-    for trip in all_trips:
-        if trip.name and trip.name.lower() == trip_name.lower():
-            return trip
+    trip = trip_index.exact.get(name_lower)
+    if trip:
+        return trip
     
-    # Then try partial match
-    for trip in all_trips:
-        if trip.name and trip_name.lower() in trip.name.lower():
-            return trip
+    # Then try partial match: only trips having every trigram of the name
+    # can contain it
+    postings = sorted(
+        (trip_index.trigrams.get(name_lower[start:start + 3], ()) for start in range(len(name_lower) - 2)),
+        key=len
+    )
+    if postings[0]:
+        hits = [i for i in set(postings[0]).intersection(*postings[1:]) if name_lower in named[i][0]]
+        if hits:
+            return named[min(hits)][1]
+    
+    # Finally try reverse partial match: every trip name inside the name
+    hits = [i for _, i in trip_index.automaton.iter(name_lower)]
+    if hits:
+        return named[min(hits)][1]
+    
+    return None
+
+
+def find_typo_trip(trip_name, trip_index):
+    """
+    Find the trip a misspelled trip name most likely refers to.
+    
+    Fallback for names find_matching_trip() does not match. Candidates are
+    the trips sharing a trigram with the name and the same numbers (years,
+    so "Peru 2023" never becomes "Peru 2024"), within an edit distance of
+    max(1, shorter length // 5). Only a single closest trip is returned; a
+    tie is ambiguous and returns None.
+    
+    Args:
+        trip_name: Trip name to search for
+        trip_index: TripIndex from build_trip_index()
+    
+    Returns:
+        Trip: Matching trip or None
+    """
+    if not trip_name:
+        return None
     
-    # Finally try reverse partial match
-    for trip in all_trips:
-        if trip.name and trip.name.lower() in trip_name.lower():
-            return trip
+    trip_name = str(trip_name).strip()
+    if len(trip_name) < 3:  # Skip very short names
+        return None
+    name_lower = trip_name.lower()
+    name_numbers = re.findall(r'\d+', name_lower)
+    
+    named = trip_index.named
+    candidates = set().union(*(
+        trip_index.trigrams.get(name_lower[start:start + 3], ()) for start in range(len(name_lower) - 2)
+    ))
+    best_distance = None
+    best = []
+    for i in sorted(candidates):
+        trip_lower = named[i][0]
+        if re.findall(r'\d+', trip_lower) != name_numbers:
+            continue
+        max_dist = max(1, min(len(name_lower), len(trip_lower)) // 5)
+        if best_distance is not None:
+            max_dist = min(max_dist, best_distance)
+        distance = bounded_levenshtein(name_lower, trip_lower, max_dist)
+        if distance is None:
+            continue
+        if best_distance is None or distance < best_distance:
+            best_distance = distance
+            best = [i]
+        elif distance == best_distance and trip_lower != named[best[0]][0]:
+            best.append(i)
+    
+    if len(best) == 1:
+        return named[best[0]][1]
     
     return None
 
 
-def link_passengers_to_trips():
-    """Main function to link passengers to trips."""
+def link_passengers_to_trips(use_cache=True):
+    """Main function to link passengers to trips (use_cache=False always refetches from GHL)."""
     
     print("=" * 70)
     print("PASSENGER-TRIP LINKING SCRIPT")
@@ -108,10 +404,16 @@ def link_passengers_to_trips():
     )
     
     with app.app_context():
-        # Get counts
-        total_passengers = Passenger.query.count()
-        passengers_without_trip = Passenger.query.filter_by(trip_id=None).count()
-        total_trips = Trip.query.count()
+        # Get counts: one scan of passengers (COUNT(trip_id) skips NULLs, i.e.
+        # counts linked passengers) plus the trip count, in one round trip
+        total_passengers, linked_passengers, total_trips = db.session.execute(
+            select(
+                func.count(Passenger.id),
+                func.count(Passenger.trip_id),
+                select(func.count(Trip.id)).scalar_subquery()
+            )
+        ).one()
+        passengers_without_trip = total_passengers - linked_passengers
         
         print(f"📊 Database Status:")
         print(f"   Total Passengers: {total_passengers}")
@@ -126,66 +428,122 @@ def link_passengers_to_trips():
         # Load all trips into memory for faster matching
         print("📚 Loading all trips into memory...")
         all_trips = Trip.query.all()
+        trip_index = build_trip_index(all_trips)
         print(f"   Loaded {len(all_trips)} trips")
         print()
         
-        # Process passengers in batches
-        batch_size = 100
         linked_count = 0
         not_found_count = 0
+        # (passenger id, GHL trip name, matched trip name) linked by find_typo_trip()
+        typo_links = []
         error_count = 0
         
-        print(f"🔗 Starting to link passengers (batch size: {batch_size})...")
+        print("🔗 Starting to link passengers...")
         print()
         
-        # Get all passengers without trip_id
-        passengers = Passenger.query.filter_by(trip_id=None).all()
+        # Passengers without trip_id are streamed STREAM_BATCH ids at a time
+        # (only the id is used, so no Passenger objects are loaded or left to
+        # expire on commit). Per batch: fetch the trip names from GHL
+        # concurrently, in passenger order, match them, and write the matches
+        # with one executemany UPDATE; a single commit follows the last batch.
+        # The Passenger pipeline search runs once, the first time a batch has
+        # passengers without a fresh cache entry (with --no-cache, always)
+        cache = load_opportunity_cache() if use_cache else {}
+        fetch = partial(get_trip_name_from_opportunity, api, cache=cache)
+        searched = False
+        
+        def uncached(batch):
+            return sum(1 for pid in batch if pid not in cache or not is_fresh(cache[pid]))
         
-        for i, passenger in enumerate(passengers, 1):
-            try:
-                # Fetch trip name from GHL
-                trip_name = get_trip_name_from_opportunity(api, passenger.id)
-                
-                if trip_name:
-                    # Try to find matching trip
-                    matching_trip = find_matching_trip(trip_name, all_trips)
+        passengers_table = Passenger.__table__
+        link_passengers = (
+            update(passengers_table)
+            .where(passengers_table.c.id == bindparam('b_id'))
+            .values(trip_id=bindparam('b_trip_id'))
+        )
+        unlinked_ids = db.session.scalars(
+            select(Passenger.id)
+            .where(Passenger.trip_id.is_(None))
+            .execution_options(yield_per=STREAM_BATCH)
+        )
+        
+        try:
+            with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+                for batch in unlinked_ids.partitions():
+                    if not searched and uncached(batch):
+                        searched = True
+                        print(f"📥 Searching Passenger pipeline opportunities ({PAGE_SIZE} per page)...")
+                        try:
+                            prefetch_passenger_opportunities(api, cache)
+                        except Exception as e:
+                            print(f"   ⚠️  Error searching opportunities: {e}")
+                    missing = uncached(batch)
+                    if missing:
+                        print(f"📥 Fetching {missing} opportunities from GHL ({FETCH_WORKERS} at a time)...")
                     
-                    if matching_trip:
-                        passenger.trip_id = matching_trip.id
-                        db.session.add(passenger)
-                        linked_count += 1
-                        
-                        if linked_count % 10 == 0:
-                            print(f"   ✅ Linked {linked_count} passengers...")
-                    else:
-                        not_found_count += 1
-                        if not_found_count <= 10:  # Only show first 10
-                            print(f"   ⚠️  No trip match for: '{trip_name}' (passenger {passenger.id})")
-                else:
-                    not_found_count += 1
-                
-                # Commit every batch_size records
-                if i % batch_size == 0:
-                    db.session.commit()
-                    print(f"   💾 Committed batch (processed {i}/{len(passengers)})")
+                    # Matches are collected as (passenger id, trip id) pairs;
+                    # nothing is written through the ORM
+                    batch_updates = []
+                    for passenger_id, trip_name in zip(batch, executor.map(fetch, batch)):
+                        try:
+                            if trip_name:
+                                # Try to find matching trip, then a unique near-miss (typo)
+                                matching_trip = find_matching_trip(trip_name, trip_index)
+                                if not matching_trip:
+                                    matching_trip = find_typo_trip(trip_name, trip_index)
+                                    if matching_trip:
+                                        typo_links.append((passenger_id, trip_name, matching_trip.name))
+                                
+                                if matching_trip:
+                                    batch_updates.append({'b_id': passenger_id, 'b_trip_id': matching_trip.id})
+                                    linked_count += 1
+                                    
+                                    if linked_count % PROGRESS_EVERY == 0:
+                                        print(f"   ✅ Linked {linked_count} passengers...")
+                                else:
+                                    not_found_count += 1
+                                    if not_found_count <= 10:  # Only show first 10
+                                        print(f"   ⚠️  No trip match for: '{trip_name}' (passenger {passenger_id})")
+                            else:
+                                not_found_count += 1
+                                
+                        except Exception as e:
+                            error_count += 1
+                            print(f"   ❌ Error processing passenger {passenger_id}: {e}")
                     
-            except Exception as e:
-                error_count += 1
-                print(f"   ❌ Error processing passenger {passenger.id}: {e}")
-                db.session.rollback()
+                    if batch_updates:
+                        db.session.execute(link_passengers, batch_updates)
+            
+            db.session.commit()
+            if linked_count:
+                print(f"   💾 Saved {linked_count} passenger links")
+        except Exception as e:
+            db.session.rollback()
+            error_count += linked_count
+            linked_count = 0
+            typo_links = []
+            print(f"   ❌ Error saving passenger links: {e}")
         
-        # Final commit
-        db.session.commit()
+        if use_cache:
+            save_opportunity_cache(cache)
         
         print()
         print("=" * 70)
         print("RESULTS")
         print("=" * 70)
         print(f"✅ Successfully linked: {linked_count} passengers")
+        if typo_links:
+            print(f"   🔤 Linked by typo match: {len(typo_links)} (review below)")
         print(f"⚠️  No match found: {not_found_count} passengers")
         print(f"❌ Errors: {error_count}")
         print()
         
+        if typo_links:
+            print("🔤 Typo matches (GHL trip name -> linked trip):")
+            for passenger_id, trip_name, linked_name in typo_links:
+                print(f"   '{trip_name}' -> '{linked_name}' (passenger {passenger_id})")
+            print()
+        
         # Verify final state
         remaining = Passenger.query.filter_by(trip_id=None).count()
         print(f"📊 Final Status:")
@@ -200,4 +558,4 @@ def link_passengers_to_trips():
 
 
 if __name__ == '__main__':
-    link_passengers_to_trips()
+    link_passengers_to_trips(use_cache='--no-cache' not in sys.argv)
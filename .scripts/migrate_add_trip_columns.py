@@ -7,6 +7,10 @@ This migration adds:
 2. 'trip_name' column to passengers table  
 3. Makes trip_id nullable in passengers table
 4. Creates field_maps table if it doesn't exist
+5. Indexes lower(trim()) trip names for case-insensitive trip linking
+6. Adds partial indexes over passengers missing a trip_name / trip_id
+7. Adds an index on trips.start_date and, where pg_trgm can be created,
+   trigram indexes for ILIKE '%term%' trip searches
 
 Usage:
     python3 migrate_add_trip_columns.py
@@ -31,88 +35,124 @@ def run_migration():
     
     with app.app_context():
         try:
+            # Every step is idempotent (IF NOT EXISTS) and PostgreSQL DDL is
+            # transactional: the steps run in one transaction and commit once
+            # at the end, or not at all
+            
             # 1. Add name column to trips table
             print("1️⃣  Adding 'name' column to trips table...")
-            try:
-                db.session.execute(text(
-                    "ALTER TABLE trips ADD COLUMN name VARCHAR(200)"
-                ))
-                db.session.commit()
-                print("   ✅ Added trips.name column")
-            except Exception as e:
-                if "already exists" in str(e) or "duplicate column" in str(e).lower():
-                    print("   ℹ️  Column trips.name already exists")
-                    db.session.rollback()
-                else:
-                    raise
+            db.session.execute(text(
+                "ALTER TABLE trips ADD COLUMN IF NOT EXISTS name VARCHAR(200)"
+            ))
+            print("   ✅ Column trips.name is in place")
             
             print()
             
             # 2. Add trip_name column to passengers table
             print("2️⃣  Adding 'trip_name' column to passengers table...")
-            try:
-                db.session.execute(text(
-                    "ALTER TABLE passengers ADD COLUMN trip_name VARCHAR(200)"
-                ))
-                db.session.commit()
-                print("   ✅ Added passengers.trip_name column")
-            except Exception as e:
-                if "already exists" in str(e) or "duplicate column" in str(e).lower():
-                    print("   ℹ️  Column passengers.trip_name already exists")
-                    db.session.rollback()
-                else:
-                    raise
+            db.session.execute(text(
+                "ALTER TABLE passengers ADD COLUMN IF NOT EXISTS trip_name VARCHAR(200)"
+            ))
+            print("   ✅ Column passengers.trip_name is in place")
             
             print()
             
             # 3. Make trip_id nullable in passengers (if not already)
             print("3️⃣  Making passengers.trip_id nullable...")
-            try:
-                # Check if it's already nullable
-                result = db.session.execute(text("""
-                    SELECT is_nullable 
-                    FROM information_schema.columns 
-                    WHERE table_name='passengers' 
-                    AND column_name='trip_id'
-                """))
-                row = result.fetchone()
-                
-                if row and row[0] == 'NO':
-                    # Make it nullable
-                    db.session.execute(text(
-                        "ALTER TABLE passengers ALTER COLUMN trip_id DROP NOT NULL"
-                    ))
-                    db.session.commit()
-                    print("   ✅ Made passengers.trip_id nullable")
-                else:
-                    print("   ℹ️  passengers.trip_id is already nullable")
-            except Exception as e:
-                print(f"   ⚠️  Could not modify trip_id: {e}")
-                db.session.rollback()
+            # Check if it's already nullable
+            is_nullable = db.session.execute(text("""
+                SELECT is_nullable 
+                FROM information_schema.columns 
+                WHERE table_name='passengers' 
+                AND column_name='trip_id'
+            """)).scalar()
+            
+            if is_nullable == 'NO':
+                # Make it nullable
+                db.session.execute(text(
+                    "ALTER TABLE passengers ALTER COLUMN trip_id DROP NOT NULL"
+                ))
+                print("   ✅ Made passengers.trip_id nullable")
+            else:
+                print("   ℹ️  passengers.trip_id is already nullable")
             
             print()
             
             # 4. Create field_maps table if it doesn't exist
             print("4️⃣  Creating field_maps table...")
+            db.session.execute(text("""
+                CREATE TABLE IF NOT EXISTS field_maps (
+                    id SERIAL PRIMARY KEY,
+                    ghl_key VARCHAR(100) UNIQUE NOT NULL,
+                    field_key VARCHAR(200) NOT NULL,
+                    table_column VARCHAR(100) NOT NULL,
+                    tablename VARCHAR(100) NOT NULL,
+                    data_type VARCHAR(50) NOT NULL
+                )
+            """))
+            print("   ✅ Table field_maps is in place")
+            
+            print()
+            
+            # 5. Expression indexes on lower(trim()) names for the passenger
+            # linking; the linkers compare the same expressions
+            print("5️⃣  Creating lower(trim()) name indexes...")
+            # Generated name_norm / trip_name_norm columns from an earlier
+            # version of this step are replaced by the expression indexes
+            # (dropping a column drops its index)
+            db.session.execute(text("ALTER TABLE trips DROP COLUMN IF EXISTS name_norm"))
+            db.session.execute(text("ALTER TABLE passengers DROP COLUMN IF EXISTS trip_name_norm"))
+            db.session.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_trips_name_norm ON trips (lower(trim(name)))"
+            ))
+            db.session.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_passengers_trip_name_norm ON passengers (lower(trim(trip_name)))"
+            ))
+            # Superseded by ix_trips_name_norm
+            db.session.execute(text("DROP INDEX IF EXISTS ix_trips_lower_name"))
+            print("   ✅ Indexes ix_trips_name_norm and ix_passengers_trip_name_norm are in place")
+            
+            print()
+            
+            # 6. Partial indexes matching the linkers' COALESCE / IS NULL filters
+            print("6️⃣  Creating partial indexes on passengers...")
+            db.session.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_passengers_missing_trip_name
+                ON passengers (id) WHERE COALESCE(trip_name, '') = ''
+            """))
+            db.session.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_passengers_missing_trip_id
+                ON passengers (id) WHERE trip_id IS NULL
+            """))
+            print("   ✅ Indexes ix_passengers_missing_trip_name and ix_passengers_missing_trip_id are in place")
+            
+            print()
+            
+            # 7. Trip search: btree for start_date ranges, trigram GIN indexes
+            # serve ILIKE '%term%' on name / destination / trip_description
+            print("7️⃣  Creating trip search indexes...")
+            db.session.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_trips_start_date ON trips (start_date)"
+            ))
+            print("   ✅ Index ix_trips_start_date is in place")
+            # The trigram indexes are optional and need pg_trgm, which the role
+            # may not be allowed to create: a failure rolls back only this
+            # savepoint, not the schema changes above
             try:
-                db.session.execute(text("""
-                    CREATE TABLE IF NOT EXISTS field_maps (
-                        id SERIAL PRIMARY KEY,
-                        ghl_key VARCHAR(100) UNIQUE NOT NULL,
-                        field_key VARCHAR(200) NOT NULL,
-                        table_column VARCHAR(100) NOT NULL,
-                        tablename VARCHAR(100) NOT NULL,
-                        data_type VARCHAR(50) NOT NULL
-                    )
-                """))
-                db.session.commit()
-                print("   ✅ Created field_maps table")
+                with db.session.begin_nested():
+                    db.session.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                    for column in ('name', 'destination', 'trip_description'):
+                        db.session.execute(text(
+                            f"CREATE INDEX IF NOT EXISTS ix_trips_{column}_trgm "
+                            f"ON trips USING gin ({column} gin_trgm_ops)"
+                        ))
+                print("   ✅ Indexes ix_trips_name_trgm, ix_trips_destination_trgm "
+                      "and ix_trips_trip_description_trgm are in place")
             except Exception as e:
-                if "already exists" in str(e):
-                    print("   ℹ️  Table field_maps already exists")
-                    db.session.rollback()
-                else:
-                    raise
+                print(f"   ⚠️  Skipped trigram indexes (pg_trgm unavailable): {e}")
+                print("      ILIKE trip searches will scan trips; re-run once pg_trgm can be created")
+            
+            db.session.commit()
             
             print()
             print("=" * 70)
@@ -132,6 +172,7 @@ def run_migration():
             import traceback
             traceback.print_exc()
             db.session.rollback()
+            print("   ↩️  Rolled back: no schema changes were applied")
             sys.exit(1)
 
 
@@ -10,6 +10,8 @@ Usage:
 
 import os
 import sys
+from contextlib import ExitStack
+from functools import partial
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -62,54 +64,51 @@ def check_raw_json():
         return False
 
 
-def check_database_tables():
+def check_database_tables(inspector):
     """Check if database tables have required columns"""
     print("3️⃣  Checking database schema...")
     
     try:
-        from app import app, db
-        from sqlalchemy import text, inspect
+        # One round of schema reflection: table names, then each table's columns once
+        table_names = set(inspector.get_table_names())
+        columns = {
+            table: {col['name'] for col in inspector.get_columns(table)}
+            for table in ('trips', 'passengers') if table in table_names
+        }
         
-        with app.app_context():
-            inspector = inspect(db.engine)
-            
-            # Check trips table
-            if 'trips' in inspector.get_table_names():
-                trips_columns = [col['name'] for col in inspector.get_columns('trips')]
-                
-                if 'name' in trips_columns:
-                    print("   ✅ trips.name column exists")
-                else:
-                    print("   ❌ trips.name column missing")
-                    print("      Run: python3 migrate_add_trip_columns.py")
-                    return False
+        # Check trips table
+        if 'trips' in columns:
+            if 'name' in columns['trips']:
+                print("   ✅ trips.name column exists")
             else:
-                print("   ❌ trips table not found")
+                print("   ❌ trips.name column missing")
+                print("      Run: python3 migrate_add_trip_columns.py")
                 return False
-            
-            # Check passengers table
-            if 'passengers' in inspector.get_table_names():
-                passengers_columns = [col['name'] for col in inspector.get_columns('passengers')]
-                
-                if 'trip_name' in passengers_columns:
-                    print("   ✅ passengers.trip_name column exists")
-                else:
-                    print("   ❌ passengers.trip_name column missing")
-                    print("      Run: python3 migrate_add_trip_columns.py")
-                    return False
+        else:
+            print("   ❌ trips table not found")
+            return False
+        
+        # Check passengers table
+        if 'passengers' in columns:
+            if 'trip_name' in columns['passengers']:
+                print("   ✅ passengers.trip_name column exists")
             else:
-                print("   ❌ passengers table not found")
+                print("   ❌ passengers.trip_name column missing")
+                print("      Run: python3 migrate_add_trip_columns.py")
                 return False
-            
-            # Check field_maps table
-            if 'field_maps' in inspector.get_table_names():
-                print("   ✅ field_maps table exists")
-            else:
-                print("   ⚠️  field_maps table missing (will be created)")
-            
-            print()
-            return True
-            
+        else:
+            print("   ❌ passengers table not found")
+            return False
+        
+        # Check field_maps table
+        if 'field_maps' in table_names:
+            print("   ✅ field_maps table exists")
+        else:
+            print("   ⚠️  field_maps table missing (will be created)")
+        
+        print()
+        return True
+        
     except Exception as e:
         print(f"   ❌ Error checking database: {e}")
         print()
@@ -117,35 +116,33 @@ def check_database_tables():
 
 
 def check_database_data():
-    """Check database has data"""
+    """Check database has data (runs inside main()'s app context)"""
     print("4️⃣  Checking database data...")
     
     try:
-        from app import app
         from models import Trip, Passenger, Contact
         
-        with app.app_context():
-            trip_count = Trip.query.count()
-            passenger_count = Passenger.query.count()
-            contact_count = Contact.query.count()
-            
-            print(f"   📊 Trips: {trip_count}")
-            print(f"   📊 Passengers: {passenger_count}")
-            print(f"   📊 Contacts: {contact_count}")
+        trip_count = Trip.query.count()
+        passenger_count = Passenger.query.count()
+        contact_count = Contact.query.count()
+        
+        print(f"   📊 Trips: {trip_count}")
+        print(f"   📊 Passengers: {passenger_count}")
+        print(f"   📊 Contacts: {contact_count}")
+        print()
+        
+        if trip_count == 0:
+            print("   ⚠️  No trips in database")
+            print("      Consider syncing trips first")
             print()
-            
-            if trip_count == 0:
-                print("   ⚠️  No trips in database")
-                print("      Consider syncing trips first")
-                print()
-            
-            if passenger_count == 0:
-                print("   ⚠️  No passengers in database")
-                print("      Consider syncing passengers first")
-                print()
-            
-            return True
-            
+        
+        if passenger_count == 0:
+            print("   ⚠️  No passengers in database")
+            print("      Consider syncing passengers first")
+            print()
+        
+        return True
+        
     except Exception as e:
         print(f"   ❌ Error checking data: {e}")
         print()
@@ -160,22 +157,37 @@ def main():
     print("═" * 70)
     print()
     
-    checks = [
-        ("Environment Variables", check_env_vars),
-        ("Raw JSON File", check_raw_json),
-        ("Database Schema", check_database_tables),
-        ("Database Data", check_database_data),
-    ]
-    
     results = {}
     
-    for check_name, check_func in checks:
+    # The database checks share one app context and one schema Inspector
+    with ExitStack() as stack:
+        inspector = None
+        database_error = None
         try:
-            results[check_name] = check_func()
+            from app import app, db
+            from sqlalchemy import inspect
+            stack.enter_context(app.app_context())
+            inspector = inspect(db.engine)
         except Exception as e:
-            print(f"   ❌ {check_name} check failed: {e}")
-            results[check_name] = False
-            print()
+            database_error = e
+        
+        # (name, check, needs the database)
+        checks = [
+            ("Environment Variables", check_env_vars, False),
+            ("Raw JSON File", check_raw_json, False),
+            ("Database Schema", partial(check_database_tables, inspector), True),
+            ("Database Data", check_database_data, True),
+        ]
+        
+        for check_name, check_func, needs_database in checks:
+            try:
+                if needs_database and database_error:
+                    raise database_error
+                results[check_name] = check_func()
+            except Exception as e:
+                print(f"   ❌ {check_name} check failed: {e}")
+                results[check_name] = False
+                print()
     
     print()
     print("═" * 70)
@@ -9,6 +9,7 @@ from datetime import datetime
 from flask import Flask, render_template, request, redirect, url_for, flash
 from flask_migrate import Migrate
 from dotenv import load_dotenv
+from sqlalchemy.engine import make_url
 
 # Load environment variables
 load_dotenv()
@@ -27,6 +28,12 @@ app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-pro
 app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///tripbuilder.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+# Batch executemany: bulk INSERTs go out as multi-row VALUES pages, and on
+# psycopg2 UPDATE/DELETE executemany uses execute_batch too
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'insertmanyvalues_page_size': 10000}
+if make_url(app.config['SQLALCHEMY_DATABASE_URI']).get_dialect().driver == 'psycopg2':
+    app.config['SQLALCHEMY_ENGINE_OPTIONS']['executemany_mode'] = 'values_plus_batch'
+
 # Initialize extensions
 db.init_app(app)
 migrate = Migrate(app, db)
@@ -11,10 +11,15 @@ Based on GHL API v2.0 (Version: 2021-07-28)
 """
 
 import requests
+import threading
 import time
 import json
+from pathlib import Path
 from typing import Dict, List, Optional, Any
 from urllib.parse import urljoin
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
 
 
 class GoHighLevelAPIError(Exception):
@@ -37,33 +42,59 @@ class GoHighLevelAPI:
         session (requests.Session): Persistent HTTP session
     """
     
+    # Keep-alive connection pool and transport-level retries
+    POOL_CONNECTIONS = 16
+    POOL_MAXSIZE = 32
+    MAX_RETRIES = 5
+    RETRY_BACKOFF = 0.2
+    
     def __init__(self, location_id: str, api_key: str, base_url: str = "https://services.leadconnectorhq.com"):
         self.location_id = location_id
         self.api_key = api_key
         self.base_url = base_url
         self.session = requests.Session()
         
+        # Pooled keep-alive connections, so paginated calls reuse one TLS
+        # session. Idempotent requests retry on connection errors and on
+        # 429/5xx gateway responses (honoring Retry-After); once retries are
+        # exhausted the last response is returned and handled as usual.
+        adapter = HTTPAdapter(
+            pool_connections=self.POOL_CONNECTIONS,
+            pool_maxsize=self.POOL_MAXSIZE,
+            max_retries=Retry(
+                total=self.MAX_RETRIES,
+                backoff_factor=self.RETRY_BACKOFF,
+                status_forcelist=(429, 502, 503, 504),
+                raise_on_status=False
+            )
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
         # Set default headers
         self.session.headers.update({
             "Authorization": f"Bearer {api_key}",
             "Version": "2021-07-28",
             "Content-Type": "application/json",
-            "Accept": "application/json"
+            "Accept": "application/json",
+            # gzip/deflate plus br/zstd when their decoders are installed
+            "Accept-Encoding": ACCEPT_ENCODING
         })
         
-        # Rate limiting
-        self.last_request_time = 0
-        self.min_request_interval = 0.1  # 100ms between requests
+        # Rate limiting (monotonic clock, integer nanoseconds)
+        self.last_request_time_ns = 0
+        self.min_request_interval_ns = 100_000_000  # 100ms between requests
+        self._rate_lock = threading.Lock()
     
     def _rate_limit(self):
-        """Implement rate limiting"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+        """Implement rate limiting (thread-safe: each caller reserves its own send slot)"""
+        with self._rate_lock:
+            now = time.monotonic_ns()
+            slot = max(now, self.last_request_time_ns + self.min_request_interval_ns)
+            self.last_request_time_ns = slot
         
-        if time_since_last < self.min_request_interval:
-            time.sleep(self.min_request_interval - time_since_last)
-        
-        self.last_request_time = time.time()
+        if slot > now:
+            time.sleep((slot - now) / 1e9)
     
     def _make_request(
         self,
@@ -321,6 +352,43 @@ class GoHighLevelAPI:
         
         return self._make_request("GET", f"locations/{loc_id}/customFields", params=params)
     
+    def get_custom_fields_cached(
+        self,
+        location_id: Optional[str] = None,
+        model: Optional[str] = None,
+        max_age: float = 3600,
+        cache_dir: str = ".cache"
+    ) -> Dict:
+        """
+        Get custom field definitions, reusing a local JSON copy for repeated runs.
+        
+        Field definitions rarely change, so scripts that are re-run while
+        debugging can skip the API call. The cache file is keyed by location
+        and model and is refetched once it is older than max_age seconds.
+        
+        Args:
+            location_id: Location ID (uses instance location_id if not provided)
+            model: Filter by model ('opportunity' or 'contact')
+            max_age: Maximum cache age in seconds (0 forces a refetch)
+            cache_dir: Directory for cache files
+        
+        Returns:
+            Dict: {'customFields': [...]}
+        """
+        loc_id = location_id or self.location_id
+        cache_file = Path(cache_dir) / f"custom_fields_{loc_id}_{model or 'all'}.json"
+        
+        try:
+            if time.time() - cache_file.stat().st_mtime < max_age:
+                return json.loads(cache_file.read_bytes())
+        except (OSError, ValueError):
+            pass
+        
+        data = self.get_custom_fields(loc_id, model)
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(json.dumps(data))
+        return data
+    
     # =====================================================================
     # UTILITY METHODS
     # =====================================================================
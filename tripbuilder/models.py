@@ -8,9 +8,10 @@ IMPORTANT: This file reflects the ACTUAL database schema.
 """
 
 from datetime import datetime
+from functools import lru_cache
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.dialects.postgresql import ARRAY
-from sqlalchemy import String, Text, Integer, Date, DateTime, JSON, ForeignKey, Boolean, Numeric
+from sqlalchemy import String, Text, Integer, Date, DateTime, JSON, ForeignKey, Boolean, Numeric, func, select
 from sqlalchemy.orm import relationship
 
 db = SQLAlchemy()
@@ -92,6 +93,14 @@ class Trip(db.Model):
     passengers = relationship('Passenger', back_populates='trip', cascade='all, delete-orphan')
     vendor = relationship('TripVendor', back_populates='trips')
     
+    # Case-insensitive trip name lookups (passenger linking) and trip search
+    __table_args__ = (
+        db.Index('ix_trips_name_norm', func.lower(func.trim(name))),
+        db.Index('ix_trips_start_date', start_date),
+        # PostgreSQL also has pg_trgm GIN indexes on name, destination and
+        # trip_description (migrate_add_trip_columns.py, needs the extension)
+    )
+    
     def __repr__(self):
         return f'<Trip {self.id}: {self.destination}>'
 
@@ -222,6 +231,23 @@ class Passenger(db.Model):
     trip = relationship('Trip', back_populates='passengers')
     stage = relationship('PipelineStage')
     
+    # Partial indexes over the passengers still to be linked (the linkers
+    # filter on COALESCE(trip_name, '') = '' and trip_id IS NULL), and the
+    # lower(trim(trip_name)) they join to lower(trim(trips.name)) on
+    __table_args__ = (
+        db.Index(
+            'ix_passengers_missing_trip_name', id,
+            postgresql_where=func.coalesce(trip_name, '') == '',
+            sqlite_where=func.coalesce(trip_name, '') == ''
+        ),
+        db.Index(
+            'ix_passengers_missing_trip_id', id,
+            postgresql_where=trip_id.is_(None),
+            sqlite_where=trip_id.is_(None)
+        ),
+        db.Index('ix_passengers_trip_name_norm', func.lower(func.trim(trip_name))),
+    )
+    
     def __repr__(self):
         return f'<Passenger {self.id}: Contact {self.contact_id} on Trip {self.trip_id}>'
 
@@ -346,6 +372,27 @@ class FieldMap(db.Model):
         return f'<FieldMap {self.tablename}.{self.table_column} <- {self.field_key}>'
 
 
+@lru_cache(maxsize=256)
+def field_map_cached(tablename, field_key):
+    """
+    Look up the field map for a table and GHL field key, once per process.
+    
+    Returns a read-only row (ghl_key, field_key, table_column, tablename,
+    data_type) rather than a FieldMap instance, so it stays valid across
+    sessions and app contexts; None if there is no mapping. Call
+    field_map_cached.cache_clear() after writing to field_maps.
+    """
+    return db.session.execute(
+        select(
+            FieldMap.ghl_key,
+            FieldMap.field_key,
+            FieldMap.table_column,
+            FieldMap.tablename,
+            FieldMap.data_type
+        ).filter_by(tablename=tablename, field_key=field_key).limit(1)
+    ).first()
+
+
 class SyncLog(db.Model):
     """
     Log of synchronization operations with GHL.